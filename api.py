@@ -1,20 +1,15 @@
-import sys
-import cv2
-import numpy as np
-# Fix for TensorFlow typing issue in Python 3.9
-if sys.version_info < (3, 10):
-    from typing import List, Optional, Union
-import tensorflow as tf
-from tensorflow.keras import models, layers
-from tensorflow.keras.applications import EfficientNetB0
-from tensorflow.keras.applications.efficientnet import preprocess_input
-import tempfile
-import shutil
-import os
+from typing import Optional
 import logging
-from fastapi import FastAPI, UploadFile, File
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
+from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
 import uvicorn
+from upload_storage import open_upload_path, upload_digest
+from shot_model import classes, load_model, build_inference_model, frames_from_video_file, classify_frames, top_predictions
+from shot_similarity import shot_similarity, cosine_similarity
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -31,185 +26,67 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Define class labels
-classes = {
-    'cover': 0, 
-    'defense': 1, 
-    'flick': 2, 
-    'hook': 3, 
-    'late_cut': 4, 
-    'lofted': 5, 
-    'pull': 6, 
-    'square_cut': 7, 
-    'straight': 8, 
-    'sweep': 9
-}
-
-# Global variable to hold the model
-model = None
+# Model and preprocessing are shared with the Streamlit app
 model_weights_path = 'model_weights.h5'
-
-# Function to load the model
-def load_model(weights_path):
-    global model
-    base_model = EfficientNetB0(include_top=False, weights='imagenet', input_shape=(224, 224, 3))
-
-    # Set the base model as non-trainable
-    base_model.trainable = False
-
-    # Define the full model using a Sequential model - matching the original saved weights (5 layers)
-    model = models.Sequential([
-        # Apply EfficientNetB0 to each frame of the video
-        layers.TimeDistributed(base_model, input_shape=(None, 224, 224, 3)),
-        layers.TimeDistributed(layers.GlobalAveragePooling2D()),
-
-        # Use GRU layers to capture temporal relationships
-        layers.GRU(256, return_sequences=True),
-        layers.GRU(128),
-
-        # Dense layers for classification
-        layers.Dense(1024, activation='relu'),
-        layers.Dropout(0.5),
-        layers.Dense(10, activation='softmax')
-    ])
-    
-    model.load_weights(weights_path)
-    return model
-
-def format_frames(frame, output_size):
-    """
-    Pad and resize an image from a video and apply proper preprocessing.
-
-    Args:
-      frame: Image that needs to resized and padded.
-      output_size: Pixel size of the output frame image.
-
-    Return:
-      Formatted frame with padding of specified output size, properly preprocessed.
-    """
-    # Convert to float32 for processing
-    frame = tf.image.convert_image_dtype(frame, tf.float32)
-    # Resize with padding
-    frame = tf.image.resize_with_pad(frame, *output_size)
-    # Scale to [0, 255] range (EfficientNetB0 expects this)
-    frame = frame * 255.0
-    # Apply EfficientNetB0 preprocessing
-    frame = preprocess_input(frame)
-    return frame.numpy()
-
-def frames_from_video_file(video_path, n_frames, output_size=(224, 224), frame_step=1):
-    """
-    Extracts frames sequentially from the start of the video file, with a specified step between frames.
-
-    Args:
-      video_path: File path to the video.
-      n_frames: Number of frames to be created per video file.
-      output_size: Pixel size of the output frame image (height, width).
-      frame_step: Number of frames to skip between extracted frames.
-
-    Returns:
-      A NumPy array of frames in the shape of (n_frames, height, width, channels).
-    """
-    result = []
-    src = cv2.VideoCapture(str(video_path))
-
-    src.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Start from the first frame
-
-    # Attempt to read the first frame
-    ret, frame = src.read()
-    if ret:
-        frame = format_frames(frame, output_size)
-        result.append(frame)
-    else:
-        # If the first frame can't be read, append a zero frame and exit
-        result.append(np.zeros((output_size[0], output_size[1], 3), dtype=np.uint8))
-
-    # Read subsequent frames with the specified frame_step
-    for _ in range(n_frames - 1):
-        for _ in range(frame_step):
-            ret, frame = src.read()
-        if ret:
-            frame = format_frames(frame, output_size)
-            result.append(frame)
-        else:
-            # Append a zero-like frame if no more frames can be read
-            result.append(np.zeros_like(result[0]))
-
-    src.release()
-
-    # Convert the list of frames to a NumPy array and adjust color channels from BGR to RGB
-    result = np.array(result)[..., [2, 1, 0]]
-
-    return result
-
-# Function to classify video
-def classify_video(video_path, model, frame_count, class_labels):
-    # Process the video file to get the frames
+inference_model = None
+
+# Classifications keyed by upload sha256, so /similarity/ and /embeddings/ reuse them
+MAX_CACHED_ANALYSES = 128
+analysis_cache = OrderedDict()
+# /classify-video/ runs in the threadpool, so the cache and the lazy model load are locked
+analysis_lock = threading.Lock()
+model_lock = threading.Lock()
+
+def get_inference_model():
+    """Load the model on first use and keep it for the life of the process"""
+    global inference_model
+    with model_lock:
+        if inference_model is None:
+            logger.info("Loading model...")
+            inference_model = build_inference_model(load_model(model_weights_path))
+            logger.info("Model loaded successfully")
+    return inference_model
+
+def remember_analysis(video_id, analysis):
+    with analysis_lock:
+        analysis_cache[video_id] = analysis
+        analysis_cache.move_to_end(video_id)
+        while len(analysis_cache) > MAX_CACHED_ANALYSES:
+            analysis_cache.popitem(last=False)
+
+def get_analysis(video_id):
+    with analysis_lock:
+        analysis = analysis_cache.get(video_id)
+    if analysis is None:
+        raise HTTPException(status_code=404, detail="Unknown videoId; classify the video first")
+    return analysis
+
+# Function to classify video with the same forward pass the Streamlit app uses
+def classify_video(video_path, inference_model, frame_count, class_labels):
     frames = frames_from_video_file(video_path, frame_count)
-    print(f"Frames shape: {frames.shape}")
-    print(f"Frames dtype: {frames.dtype}")
-    print(f"Frames min: {frames.min()}, max: {frames.max()}")
-
-    # Add batch dimension if the model expects it
-    frames = np.expand_dims(frames, axis=0)
-    print(f"Batch frames shape: {frames.shape}")
-
-    # Use the model to predict the class probabilities
-    predictions = model.predict(frames)
-    print("Raw predictions:", predictions)
-
-    # Convert predictions to class labels
-    predicted_class_idx = np.argmax(predictions, axis=1)[0]  # Get the index of the max class score
-    print("Predicted class index:", predicted_class_idx)
-    
-    # Get the class name using the predicted index
-    predicted_class_name = list(class_labels.keys())[list(class_labels.values()).index(predicted_class_idx)]
-    
-    # Calculate the confidence percentage of the predicted class
-    confidence = predictions[0][predicted_class_idx] * 100  # Assuming softmax output, multiply by 100 for percentage
-    print("Confidence (%): {:.2f}%".format(confidence))
-    
-    # Get top 3 predictions
-    top_3_indices = np.argsort(predictions[0])[-3:][::-1]  # Get indices of top 3 in descending order
-    top_3_predictions = []
-    print("\nTop 3 Predictions:")
-    for idx in top_3_indices:
-        class_name = list(class_labels.keys())[list(class_labels.values()).index(idx)]
-        confidence_score = predictions[0][idx] * 100
-        top_3_predictions.append({
-            'shotType': class_name,
-            'confidence': round(float(confidence_score), 2)
-        })
-        print(f"  {class_name}: {confidence_score:.4f}%")
-    
-    # Print all class probabilities
-    print("\nAll class predictions:")
-    for class_name, class_idx in sorted(class_labels.items(), key=lambda x: x[1]):
-        print(f"  {class_name}: {predictions[0][class_idx]*100:.4f}%")
-
-    return predicted_class_name, confidence, top_3_predictions
+    class_name, confidence, embedding, frame_features, probabilities = classify_frames(
+        frames, inference_model, class_labels
+    )
+    top_3_predictions = top_predictions(probabilities, class_labels, 3)
+    return class_name, confidence, top_3_predictions, embedding, frame_features
 
 @app.on_event("startup")
 async def startup_event():
     logger.info("Cricket Shot Classification API started")
     logger.info(f"Model weights path: {model_weights_path}")
-    logger.info("Model will be loaded on each /classify-video/ request")
+    logger.info("Model will be loaded on the first /classify-video/ request")
 
 @app.get("/")
 async def root():
     return {"message": "Cricket Shot Classification API"}
 
+# A plain def so FastAPI runs decoding and inference in its threadpool instead of blocking the event loop
 @app.post("/classify-video/")
-async def classify_video_endpoint(file: UploadFile = File(...)):
+def classify_video_endpoint(file: UploadFile = File(...)):
     # Log file information
     logger.info(f"Received file: {file.filename}")
     logger.info(f"File content type: {file.content_type}")
     
-    # Load the model for this request
-    logger.info("Loading model...")
-    request_model = load_model(model_weights_path)
-    logger.info("Model loaded successfully")
-    
     # Save the uploaded file temporarily
     # Preserve original file extension
     file_extension = '.mp4'  # default
@@ -219,14 +96,34 @@ async def classify_video_endpoint(file: UploadFile = File(...)):
             file_extension = '.' + ext
             logger.info(f"Using file extension: {file_extension}")
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmpfile:
-        shutil.copyfileobj(file.file, tmpfile)
-        tmp_path = tmpfile.name
-        logger.info(f"Saved file to temporary path: {tmp_path}")
+    # Uploads are identified by content hash so repeat uploads skip decoding and inference
+    video_id = upload_digest(file.file)
+    upload_buffer = ExitStack()
+    tmp_path = None
 
     try:
-        # Classify the video using the loaded model
-        class_name, confidence, top_3_predictions = classify_video(tmp_path, request_model, 30, classes)
+        with analysis_lock:
+            analysis = analysis_cache.get(video_id)
+        if analysis is None:
+            # Small uploads stay in memory; larger ones spill to the temp directory
+            tmp_path = upload_buffer.enter_context(open_upload_path(file.file, suffix=file_extension))
+            logger.info(f"Exposed upload to OpenCV at: {tmp_path}")
+
+            # Classify the video using the loaded model
+            class_name, confidence, top_3_predictions, embedding, frame_features = classify_video(
+                tmp_path, get_inference_model(), 30, classes
+            )
+            analysis = {
+                'class': class_name,
+                'confidence': confidence,
+                'top3': top_3_predictions,
+                'embedding': embedding,
+                'frame_features': frame_features,
+            }
+            remember_analysis(video_id, analysis)
+        else:
+            logger.info(f"Reusing classification for video {video_id}")
+        class_name, confidence, top_3_predictions = analysis['class'], analysis['confidence'], analysis['top3']
         
         # Map class names to more readable formats
         class_display_names = {
@@ -253,6 +150,8 @@ async def classify_video_endpoint(file: UploadFile = File(...)):
         
         # Prepare response data
         result = {
+            "videoId": video_id,
+            "shotClass": class_name,
             "shotType": class_display_names.get(class_name, class_name),
             "confidence": round(float(confidence), 2),
             "top3Predictions": top_3_with_display_names,
@@ -277,12 +176,41 @@ async def classify_video_endpoint(file: UploadFile = File(...)):
         # Re-raise the exception so the client gets an error response
         raise e
     finally:
-        # Clean up the temporary file
+        # Release the in-memory buffer or temporary file
         try:
-            os.unlink(tmp_path)
-            logger.info(f"Cleaned up temporary file: {tmp_path}")
+            upload_buffer.close()
+            logger.info(f"Released upload storage: {tmp_path}")
         except Exception as e:
-            logger.warning(f"Failed to delete temporary file: {str(e)}")
+            logger.warning(f"Failed to release upload storage: {str(e)}")
+
+@app.get("/embeddings/{video_id}")
+async def get_embeddings(video_id: str):
+    """Return the pooled embedding and per-frame features stored for a classified video"""
+    analysis = get_analysis(video_id)
+    return {
+        "videoId": video_id,
+        "embedding": analysis['embedding'].tolist(),
+        "frameFeatures": analysis['frame_features'].tolist(),
+    }
+
+class SimilarityRequest(BaseModel):
+    videoId1: str
+    videoId2: str
+    band: Optional[int] = 10
+
+@app.post("/similarity/")
+async def similarity_endpoint(request: SimilarityRequest):
+    """Compare two classified videos using their stored features"""
+    analysis1 = get_analysis(request.videoId1)
+    analysis2 = get_analysis(request.videoId2)
+    similarity, alignment = shot_similarity(analysis1['frame_features'], analysis2['frame_features'], band=request.band)
+    return {
+        "similarity": round(similarity, 4),
+        "pooledSimilarity": round(cosine_similarity(analysis1['embedding'], analysis2['embedding']), 4),
+        "alignedFrames": len(alignment),
+        "alignment": alignment.tolist(),
+        "sameShotClass": analysis1['class'] == analysis2['class'],
+    }
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import psycopg
+
+from data_versions import DATA_CHANGED_CHANNEL, VERSIONED_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Cache bounds, overridable from the environment
+CACHE_TTL = float(os.environ.get('API_CACHE_TTL', 300.0))
+CACHE_MAX_ENTRIES = int(os.environ.get('API_CACHE_MAX_ENTRIES', 1024))
+LISTEN_RETRY_DELAY = 5.0
+
+
+class ResponseCache:
+    """
+    Read-through TTL cache for query results.
+
+    Entries are tagged with the tables they were read from, so a change to one
+    table only drops the entries that depend on it. Least recently used
+    entries are evicted once max_entries is reached. Concurrent misses on the
+    same key share a single load.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: Hashable, tables: Iterable[str], loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        pending = self._loading.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(key, frozenset(tables), loader))
+            self._loading[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _load(self, key, tables, loader):
+        generation = self._generation
+        try:
+            value = await loader()
+            if generation != self._generation:
+                # Invalidated while loading, so the value may already be stale
+                return value
+            self._entries[key] = (time.monotonic() + self.ttl, tables, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def invalidate(self, table: str):
+        """Drop every entry read from table"""
+        stale = [key for key, (_, tables, _) in self._entries.items() if table in tables]
+        for key in stale:
+            del self._entries[key]
+        self._generation += 1
+        self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+class DataVersions:
+    """
+    Last known version and modification time of each scraped table.
+
+    Loaded from data_versions when the change listener connects and updated
+    from every notification after that. Tables that were never bumped fall
+    back to their max(scraped_at). While the listener is disconnected nothing
+    is known, so callers never derive validators from stale versions.
+    """
+
+    def __init__(self):
+        self._versions = {}
+
+    async def load(self, conn):
+        versions = {}
+        for table in VERSIONED_TABLES:
+            cursor = await conn.execute(
+                "SELECT version, extract(epoch FROM updated_at) FROM data_versions WHERE table_name = %s", (table,)
+            )
+            row = await cursor.fetchone()
+            if row is None:
+                cursor = await conn.execute(f"SELECT 0, extract(epoch FROM max(scraped_at)::timestamptz) FROM {table}")
+                row = await cursor.fetchone()
+            versions[table] = (int(row[0]), float(row[1] or 0))
+        self._versions = versions
+
+    def update(self, table: str, version: int, updated_at: float):
+        self._versions[table] = (version, updated_at)
+
+    def clear(self):
+        self._versions = {}
+
+    def state(self, tables: Iterable[str]) -> Optional[Tuple[str, float]]:
+        """
+        A token that changes whenever any of tables changes, and their latest
+        modification time. None if a table's version is not known.
+        """
+        try:
+            entries = [(table, *self._versions[table]) for table in sorted(tables)]
+        except KeyError:
+            return None
+        token = ';'.join(f"{table}:{version}:{updated_at:.6f}" for table, version, updated_at in entries)
+        return token, max(updated_at for _, _, updated_at in entries)
+
+
+async def listen_for_changes(conninfo: str, cache: ResponseCache, versions: DataVersions):
+    """
+    Invalidate cache entries and track table versions as scrapers commit.
+
+    Holds a dedicated connection LISTENing on the data_changed channel. The
+    cache is cleared and the versions reloaded every time the connection is
+    (re)established, since notifications sent while it was down are lost.
+    """
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(conninfo, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {DATA_CHANGED_CHANNEL}")
+                await versions.load(conn)
+                cache.clear()
+                logger.info("Listening for data changes on '%s'", DATA_CHANGED_CHANNEL)
+                async for notify in conn.notifies():
+                    change = json.loads(notify.payload)
+                    versions.update(change['table'], change['version'], change['updated_at'])
+                    cache.invalidate(change['table'])
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error("Data change listener failed: %s", exc)
+            versions.clear()
+            cache.clear()
+        await asyncio.sleep(LISTEN_RETRY_DELAY)
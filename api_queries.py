@@ -0,0 +1,185 @@
+"""
+SQL the Stadiums API runs, shared with the tools that check and time it.
+
+check_query_plans.py and bench_search.py import the statements from here
+rather than from stadiums_api.py, so they run the exact SQL the endpoints
+do without pulling in FastAPI or the connection pool. Statements whose
+shape depends on the request are built by the functions below.
+"""
+
+from typing import List
+
+# /stadiums filters, ANDed together by stadiums_sql
+STADIUM_AFTER_CURSOR = "(ground_name, id) > (%s, %s)"
+STADIUM_PITCH_TYPE = "pitch_type = %s"
+STADIUM_NAME_PREFIX = "lower(ground_name) LIKE %s"
+
+
+def stadiums_sql(columns: List[str], conditions: List[str], limited: bool) -> str:
+    """/stadiums query; a limited one takes the row limit as its last parameter"""
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+        SELECT {', '.join(columns)}
+        FROM stadiums
+        {where}
+        ORDER BY ground_name, id
+        {'LIMIT %s' if limited else ''}
+    """
+
+
+STADIUM_BY_ID_SQL = """
+    SELECT id, ground_name, pitch_type, pitch_description, url, scraped_at
+    FROM stadiums
+    WHERE id = %s
+"""
+
+PLAYERS_BY_FORMAT_SQL = """
+    SELECT
+        pp.id,
+        tsp.player_name,
+        tsp.player_info,
+        tsp.player_link,
+        tsp.image_url,
+        pp.personal_info,
+        pp.batting_stats,
+        pp.bowling_stats,
+        pp.profile_url,
+        pp.scraped_at
+    FROM team_squad_players tsp
+    LEFT JOIN player_profiles pp ON tsp.player_name = pp.player_name
+    WHERE tsp.format = %s
+    ORDER BY tsp.player_name
+    LIMIT 15
+"""
+
+STAT_COLUMNS = ('matches', 'innings', 'runs', 'average', 'strike_rate', 'wickets', 'economy')
+
+# Params: game type, squad format
+SQUAD_STATS_SQL = f"""
+    SELECT tsp.player_name, pfs.discipline, {', '.join('pfs.' + column for column in STAT_COLUMNS)}
+    FROM team_squad_players tsp
+    LEFT JOIN player_format_stats pfs ON pfs.player_name = tsp.player_name AND pfs.game_type = %s
+    WHERE tsp.format = %s
+    ORDER BY tsp.player_name
+"""
+
+# Params: player name, then game type and discipline twice each (None matches all)
+PLAYER_STATS_SQL = f"""
+    SELECT game_type, discipline, {', '.join(STAT_COLUMNS)}
+    FROM player_format_stats
+    WHERE player_name = %s
+      AND (%s::text IS NULL OR game_type = %s)
+      AND (%s::text IS NULL OR discipline = %s)
+    ORDER BY game_type, discipline
+"""
+
+
+def leaderboard_sql(discipline: str, column: str, direction: str, squad_only: bool) -> str:
+    """
+    Leaderboard over a player_format_stats column; params: game type, min
+    matches, limit. The discipline is inlined rather than bound so that even a
+    generic prepared plan can use the partial indexes of migration 9, which are
+    WHERE discipline = 'batting' / 'bowling'.
+    """
+    if discipline not in ('batting', 'bowling'):
+        raise ValueError(f"Unknown discipline {discipline!r}")
+    # A bowler without wickets has an average of 0 on the scraped pages, not no average
+    wickets_filter = "AND wickets > 0" if (discipline, column) == ('bowling', 'average') else ""
+    squad_filter = """
+        AND EXISTS (
+            SELECT 1 FROM team_squad_players tsp
+            WHERE tsp.format = pfs.game_type AND tsp.player_name = pfs.player_name
+        )
+    """ if squad_only else ""
+    return f"""
+        SELECT
+            rank() OVER (ORDER BY {column} {direction}) AS rank,
+            player_name,
+            {column} AS value,
+            matches,
+            innings
+        FROM player_format_stats pfs
+        WHERE game_type = %s
+          AND discipline = '{discipline}'
+          AND {column} IS NOT NULL
+          AND innings > 0
+          {wickets_filter}
+          AND COALESCE(matches, 0) >= %s
+          {squad_filter}
+        ORDER BY {column} {direction}, player_name
+        LIMIT %s
+    """
+
+
+# The whole /squad document, built in Postgres; params: team name twice (None for every team)
+SQUAD_SQL = """
+    SELECT COALESCE(json_object_agg(format, players ORDER BY format), '{}')::text
+    FROM (
+        SELECT
+            tsp.format,
+            json_agg(jsonb_build_object(
+                'id', pp.id,
+                'squad_id', tsp.id,
+                'team_name', tsp.team_name,
+                'player_name', tsp.player_name,
+                'player_info', tsp.player_info,
+                'player_link', tsp.player_link,
+                'image_url', tsp.image_url,
+                'personal_info', pp.personal_info,
+                'batting_stats', pp.batting_stats,
+                'bowling_stats', pp.bowling_stats,
+                'profile_url', pp.profile_url,
+                'scraped_at', pp.scraped_at
+            ) ORDER BY tsp.player_name) AS players
+        FROM team_squad_players tsp
+        LEFT JOIN player_profiles pp ON tsp.player_name = pp.player_name
+        WHERE %s::text IS NULL OR tsp.team_name = %s
+        GROUP BY tsp.format
+    ) squads
+"""
+
+
+def player_profiles_sql(column: str) -> str:
+    """Profiles whose column (player_name or id) is in the array parameter; newest wins per key"""
+    return f"""
+        SELECT DISTINCT ON ({column}) id, player_name, profile_url, personal_info, batting_stats, bowling_stats, scraped_at
+        FROM player_profiles
+        WHERE {column} = ANY(%s)
+        ORDER BY {column}, scraped_at DESC
+    """
+
+
+PLAYER_PROFILE_SQL = """
+    SELECT id, player_name, profile_url, personal_info, batting_stats, bowling_stats, scraped_at
+    FROM player_profiles
+    WHERE player_name = %s
+"""
+
+# Rank matches first and highlight only the winners, since ts_headline is the
+# expensive part. Full-text and trigram matches are both served by GIN indexes.
+STADIUM_SEARCH_SQL = """
+    SELECT 'stadium' AS type, id, title, score,
+           ts_headline('english', coalesce(pitch_description, ''), query,
+                       'MaxFragments=1, MaxWords=25, MinWords=8, StartSel=<mark>, StopSel=</mark>') AS snippet
+    FROM (
+        SELECT id, ground_name AS title, pitch_description, query,
+               ts_rank_cd(search_vector, query) + word_similarity(%(q)s, ground_name) AS score
+        FROM stadiums, websearch_to_tsquery('english', %(q)s) AS query
+        WHERE search_vector @@ query OR %(q)s <%% ground_name OR %(q)s <%% pitch_description
+        ORDER BY score DESC, id
+        LIMIT %(limit)s
+    ) ranked
+"""
+
+PLAYER_SEARCH_SQL = """
+    SELECT 'player' AS type, id, title, score,
+           ts_headline('simple', title, query, 'StartSel=<mark>, StopSel=</mark>') AS snippet
+    FROM (
+        SELECT id, player_name AS title, query,
+               ts_rank_cd(search_vector, query) + word_similarity(%(q)s, player_name) AS score
+        FROM player_profiles, websearch_to_tsquery('simple', %(q)s) AS query
+        WHERE search_vector @@ query OR %(q)s <%% player_name
+        ORDER BY score DESC, id
+        LIMIT %(limit)s
+    ) ranked
+"""
@@ -0,0 +1,89 @@
+"""
+Benchmark the /search queries on a large synthetic data set.
+
+Creates temporary copies of stadiums and player_profiles (same generated
+search columns and GIN indexes, via LIKE ... INCLUDING ALL) that shadow the
+real tables for this session only. It fills them with --rows synthetic rows
+and times the exact SQL stadiums_api.py runs for a mix of exact, partial and
+misspelt queries. Nothing is written to the real tables.
+
+Usage:
+  python bench_search.py [--rows 50000] [--runs 50]
+"""
+
+import time
+import argparse
+
+import numpy as np
+import psycopg2
+
+from migrations import DB_CONFIG
+from api_queries import STADIUM_SEARCH_SQL, PLAYER_SEARCH_SQL
+
+QUERIES = ['Gaddafi', 'Gadafi stadium', 'Eden Gardens', 'spin friendly', 'seam bounce', 'Babar Azam', 'Babr', 'Rizwan']
+
+SEED_SQL = """
+    INSERT INTO stadiums (id, ground_name, pitch_type, pitch_description, url)
+    SELECT
+        i,
+        (ARRAY['Gaddafi', 'National', 'Eden', 'Lords', 'Wankhede', 'Galle', 'Sharjah', 'Kensington',
+               'Newlands', 'Basin', 'Chepauk', 'Rawalpindi'])[1 + i %% 12]
+            || ' ' || (ARRAY['Stadium', 'Cricket Ground', 'Gardens', 'Oval', 'Park'])[1 + (i / 12) %% 5]
+            || ' ' || i,
+        (ARRAY['Batting', 'Bowling', 'Balanced'])[1 + i %% 3],
+        (ARRAY['Flat deck with true bounce, batting friendly early on.',
+               'Spin friendly surface that wears and turns from day three.',
+               'Green top offering seam movement and bounce for the quicks.',
+               'Slow and low, scoring gets harder as the match goes on.'])[1 + i %% 4]
+            || ' Ground ' || i || ' has hosted ' || (i %% 90) || ' internationals.',
+        'https://example.com/stadium/' || i
+    FROM generate_series(1, %(rows)s) AS i;
+
+    INSERT INTO player_profiles (id, player_name, profile_url, personal_info, batting_stats, bowling_stats)
+    SELECT
+        i,
+        (ARRAY['Babar', 'Mohammad', 'Shaheen', 'Fakhar', 'Imam', 'Shadab', 'Naseem', 'Haris'])[1 + i %% 8]
+            || ' ' || (ARRAY['Azam', 'Rizwan', 'Afridi', 'Zaman', 'ul-Haq', 'Khan', 'Shah', 'Rauf'])[1 + (i / 8) %% 8]
+            || ' ' || i,
+        'https://example.com/player/' || i,
+        '{}'::jsonb, '[]'::jsonb, '[]'::jsonb
+    FROM generate_series(1, %(rows)s) AS i;
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time /search SQL on synthetic tables")
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE TEMP TABLE stadiums (LIKE public.stadiums INCLUDING ALL)")
+            cursor.execute("CREATE TEMP TABLE player_profiles (LIKE public.player_profiles INCLUDING ALL)")
+            cursor.execute(SEED_SQL, {'rows': args.rows})
+            cursor.execute("ANALYZE stadiums")
+            cursor.execute("ANALYZE player_profiles")
+            print(f"Seeded {args.rows} stadiums and {args.rows} player profiles")
+
+            print(f"{'query':16} | {'table':8} | {'hits':>4} | {'p50':>8} | {'p99':>8}")
+            print("-" * 58)
+            for query in QUERIES:
+                for label, sql in (('stadiums', STADIUM_SEARCH_SQL), ('players', PLAYER_SEARCH_SQL)):
+                    timings = []
+                    for _ in range(args.runs):
+                        start = time.perf_counter()
+                        cursor.execute(sql, {'q': query, 'limit': args.limit})
+                        hits = len(cursor.fetchall())
+                        timings.append((time.perf_counter() - start) * 1000)
+                    p50, p99 = np.percentile(timings, [50, 99])
+                    print(f"{query:16} | {label:8} | {hits:4d} | {p50:5.2f} ms | {p99:5.2f} ms")
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
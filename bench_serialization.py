@@ -0,0 +1,77 @@
+"""
+Measure JSON serialization time and bytes on the wire per Stadiums API endpoint.
+
+For each endpoint the response is fetched once from the running API and
+decoded, then re-serialized both ways the API could produce it:
+
+  stdlib:  jsonable_encoder + json.dumps, what FastAPI does for returned dicts
+  orjson:  orjson.dumps, what stadiums_api.py now uses
+
+Bytes on the wire are measured from the API itself, with and without
+Accept-Encoding: gzip.
+
+Usage:
+  python bench_serialization.py [--url http://localhost:8001] [--runs 200]
+"""
+
+import json
+import time
+import argparse
+
+import numpy as np
+import orjson
+import requests
+from fastapi.encoders import jsonable_encoder
+
+
+def endpoints(base_url, session):
+    names = [player['player_name'] for player in session.get(f"{base_url}/players/test", timeout=30).json()]
+    stadium_ids = [stadium['id'] for stadium in session.get(f"{base_url}/stadiums", timeout=30).json()]
+    cases = [
+        ('/stadiums', 'GET', f"{base_url}/stadiums?limit=500", None),
+        ('/players/test', 'GET', f"{base_url}/players/test", None),
+        ('/squad', 'GET', f"{base_url}/squad", None),
+        ('/player-profiles', 'POST', f"{base_url}/player-profiles", {'names': names}),
+    ]
+    if stadium_ids:
+        cases.append(('/stadiums/{id}', 'GET', f"{base_url}/stadiums/{stadium_ids[0]}", None))
+    if names:
+        cases.append(('/player-profile', 'GET', f"{base_url}/player-profile/{names[0]}", None))
+    return cases
+
+
+def wire_bytes(session, method, url, body, encoding):
+    response = session.request(method, url, json=body, headers={'Accept-Encoding': encoding}, stream=True, timeout=30)
+    response.raise_for_status()
+    return len(response.raw.read(decode_content=False))
+
+
+def time_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization time and response size per endpoint")
+    parser.add_argument('--url', default='http://localhost:8001')
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    print(f"{'endpoint':18} | {'stdlib':>9} | {'orjson':>9} | {'identity':>9} | {'gzip':>9}")
+    print("-" * 68)
+    for label, method, url, body in endpoints(args.url, session):
+        payload = session.request(method, url, json=body, timeout=30).json()
+        stdlib = time_ms(lambda: json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(',', ':')).encode(), args.runs)
+        fast = time_ms(lambda: orjson.dumps(payload), args.runs)
+        identity = wire_bytes(session, method, url, body, 'identity')
+        gzipped = wire_bytes(session, method, url, body, 'gzip')
+        print(f"{label:18} | {stdlib:6.2f} ms | {fast:6.2f} ms | {identity:9d} | {gzipped:9d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark frame-aligned shot similarity against sequence length.
+
+Uses random 1280-d features (the size of the EfficientNetB0 pooled frame
+features) and reports the median time of shot_similarity with and without
+a Sakoe-Chiba band.
+
+Usage:
+  python bench_shot_similarity.py [--runs 20] [--band 8]
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from shot_similarity import shot_similarity
+
+
+def time_similarity(frames_a, frames_b, band, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        shot_similarity(frames_a, frames_b, band=band)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DTW shot similarity")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--band', type=int, default=8)
+    parser.add_argument('--lengths', type=int, nargs='*', default=[15, 30, 60, 120, 250, 500])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'frames':>8} | {'full DTW':>12} | {'band=' + str(args.band):>12}")
+    print("-" * 40)
+    for length in args.lengths:
+        frames_a = rng.random((length, 1280), dtype=np.float32)
+        frames_b = rng.random((int(length * 1.3), 1280), dtype=np.float32)
+        full = time_similarity(frames_a, frames_b, None, args.runs)
+        banded = time_similarity(frames_a, frames_b, args.band, args.runs)
+        print(f"{length:8} | {full:9.2f} ms | {banded:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare ways of loading squad pages from the Stadiums API.
+
+  squad:    /squad against one /players/{format} call per format
+  profiles: a squad page that lists /players/{format} and then fetches each
+            card's profile from /player-profile/{name} (N+1), against the
+            same list followed by one POST /player-profiles
+
+Each run is timed end to end from the client, one request after another, as
+a page load would issue them. Note that /players/{format} stops at 15 players
+per format while /squad returns every player, so the bytes column is not a
+like-for-like payload there.
+
+Usage:
+  python bench_squad_endpoints.py [--url http://localhost:8001] [--runs 100] [--format test]
+"""
+
+import time
+import argparse
+
+import numpy as np
+import requests
+
+FORMATS = ('test', 'odi', 't20i')
+
+
+def time_calls(session, calls, runs):
+    """Time runs of a sequence of (method, url, json body) calls"""
+    timings, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        size = 0
+        for method, url, body in calls:
+            response = session.request(method, url, json=body, timeout=30)
+            if response.status_code >= 500:
+                response.raise_for_status()
+            size += len(response.content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark squad and profile loading patterns")
+    parser.add_argument('--url', default='http://localhost:8001')
+    parser.add_argument('--runs', type=int, default=100)
+    parser.add_argument('--format', default='test', help="Format of the squad page for the profile comparison")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    players_url = f"{args.url}/players/{args.format}"
+    names = [player['player_name'] for player in session.get(players_url, timeout=30).json()]
+    squad = session.get(f"{args.url}/squad", timeout=30).json()
+    print(f"/squad returns {sum(len(players) for players in squad.values())} players over {len(squad)} formats")
+    print(f"/players/{args.format} page has {len(names)} players")
+
+    cases = [
+        ('3 x /players', [('GET', f"{args.url}/players/{fmt}", None) for fmt in FORMATS]),
+        ('/squad', [('GET', f"{args.url}/squad", None)]),
+        ('page N+1', [('GET', players_url, None)] + [
+            ('GET', f"{args.url}/player-profile/{name}", None) for name in names
+        ]),
+        ('page batch', [
+            ('GET', players_url, None),
+            ('POST', f"{args.url}/player-profiles", {'names': names}),
+        ]),
+    ]
+
+    print(f"\n{'case':14} | {'requests':>8} | {'p50':>9} | {'p99':>9} | {'bytes':>9}")
+    print("-" * 62)
+    for label, calls in cases:
+        timings, size = time_calls(session, calls, args.runs)
+        p50, p99 = np.percentile(timings, [50, 99])
+        print(f"{label:14} | {len(calls):8d} | {p50:6.1f} ms | {p99:6.1f} ms | {size:9d}")
+
+
+if __name__ == '__main__':
+    main()
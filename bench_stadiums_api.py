@@ -0,0 +1,113 @@
+"""
+Load test the Stadiums API with concurrent mixed traffic.
+
+Sends a weighted mix of /stadiums, /stadiums/{id}, /players/{format} and
+/player-profile/{name} requests from many concurrent clients and reports
+p50/p95/p99 latency per endpoint. Pass --compare-url to run the same load
+against a second deployment, e.g. the previous implementation started with:
+
+  git show <old-commit>:stadiums_api.py > /tmp/stadiums_api_old.py
+  (cd /tmp && uvicorn stadiums_api_old:app --port 8002)
+
+Usage:
+  python bench_stadiums_api.py [--url http://localhost:8001] [--compare-url http://localhost:8002]
+                               [--concurrency 50] [--requests 2000]
+"""
+
+import time
+import random
+import argparse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+# Share of the traffic each endpoint receives
+TRAFFIC_MIX = [
+    ('stadiums', 0.35),
+    ('stadium', 0.25),
+    ('players', 0.25),
+    ('profile', 0.15),
+]
+
+
+def discover_targets(base_url):
+    """Collect real stadium ids and player names to request"""
+    stadium_ids = [s['id'] for s in requests.get(f"{base_url}/stadiums", timeout=30).json()][:200]
+    player_names = []
+    for fmt in ('test', 'odi', 't20i'):
+        player_names += [p['player_name'] for p in requests.get(f"{base_url}/players/{fmt}", timeout=30).json()]
+    return stadium_ids or [1], sorted(set(player_names)) or ['Babar Azam']
+
+
+def build_requests(base_url, total, stadium_ids, player_names, seed=0):
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight in TRAFFIC_MIX]
+    plan = []
+    for kind in rng.choices(kinds, weights, k=total):
+        if kind == 'stadiums':
+            url = f"{base_url}/stadiums"
+        elif kind == 'stadium':
+            url = f"{base_url}/stadiums/{rng.choice(stadium_ids)}"
+        elif kind == 'players':
+            url = f"{base_url}/players/{rng.choice(['test', 'odi', 't20i'])}"
+        else:
+            url = f"{base_url}/player-profile/{rng.choice(player_names)}"
+        plan.append((kind, url))
+    return plan
+
+
+def run_load(plan, concurrency):
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+
+    def fetch(item):
+        kind, url = item
+        start = time.perf_counter()
+        response = session.get(url, timeout=60)
+        return kind, (time.perf_counter() - start) * 1000, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, plan))
+    return results, time.perf_counter() - start
+
+
+def report(label, results, elapsed):
+    by_kind = defaultdict(list)
+    errors = 0
+    for kind, ms, status in results:
+        by_kind[kind].append(ms)
+        by_kind['ALL'].append(ms)
+        if status >= 500:
+            errors += 1
+    print(f"\n{label}: {len(results)} requests in {elapsed:.1f}s ({len(results) / elapsed:.0f} req/s), {errors} server errors")
+    print(f"{'endpoint':10} | {'p50':>9} | {'p95':>9} | {'p99':>9}")
+    print("-" * 46)
+    for kind in [k for k, _ in TRAFFIC_MIX] + ['ALL']:
+        p50, p95, p99 = np.percentile(by_kind[kind], [50, 95, 99])
+        print(f"{kind:10} | {p50:6.1f} ms | {p95:6.1f} ms | {p99:6.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent mixed-traffic load test for stadiums_api")
+    parser.add_argument('--url', default='http://localhost:8001')
+    parser.add_argument('--compare-url', default=None)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    stadium_ids, player_names = discover_targets(args.url)
+    for label, url in [('current', args.url), ('compare', args.compare_url)]:
+        if not url:
+            continue
+        plan = build_requests(url, args.requests, stadium_ids, player_names)
+        results, elapsed = run_load(plan, args.concurrency)
+        report(f"{label} ({url})", results, elapsed)
+
+
+if __name__ == '__main__':
+    main()
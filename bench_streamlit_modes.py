@@ -0,0 +1,84 @@
+"""
+Measure Streamlit startup time and per-session RSS of app.py in both modes.
+
+Each mode runs in a fresh interpreter that drives app.py through Streamlit's
+AppTest harness: the first run is the startup cost (imports, and the model
+load in local mode), every further run simulates another viewer session.
+Sessions render the page without uploads, so the numbers show the baseline
+each mode costs before any video is classified.
+
+Usage:
+  python bench_streamlit_modes.py [--api-url http://localhost:8000] [--sessions 5]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def run_worker(sessions):
+    """Run inside the child interpreter and print one JSON line of measurements"""
+    baseline = rss_mb()
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    AppTest.from_file('app.py', default_timeout=600).run()
+    startup_seconds = time.perf_counter() - start
+    startup_rss = rss_mb()
+
+    for _ in range(sessions):
+        AppTest.from_file('app.py', default_timeout=600).run()
+    final_rss = rss_mb()
+
+    print(json.dumps({
+        'startup_seconds': startup_seconds,
+        'startup_rss_mb': startup_rss - baseline,
+        'per_session_rss_mb': (final_rss - startup_rss) / max(sessions, 1),
+        'tensorflow_imported': 'tensorflow' in sys.modules,
+    }))
+
+
+def measure(mode, api_url, sessions):
+    env = dict(os.environ)
+    env.pop('SHOT_API_URL', None)
+    if mode == 'thin-client':
+        env['SHOT_API_URL'] = api_url
+    output = subprocess.run(
+        [sys.executable, __file__, '--worker', '--sessions', str(sessions)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare app.py local and thin-client modes")
+    parser.add_argument('--api-url', default='http://localhost:8000')
+    parser.add_argument('--sessions', type=int, default=5)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.sessions)
+        return
+
+    print(f"{'mode':12} | {'startup':>9} | {'startup RSS':>12} | {'per session':>12} | tensorflow")
+    print("-" * 70)
+    for mode in ('local', 'thin-client'):
+        result = measure(mode, args.api_url, args.sessions)
+        print(
+            f"{mode:12} | {result['startup_seconds']:7.2f} s | {result['startup_rss_mb']:9.1f} MB | "
+            f"{result['per_session_rss_mb']:9.1f} MB | {result['tensorflow_imported']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
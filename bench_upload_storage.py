@@ -0,0 +1,89 @@
+"""
+Benchmark upload storage modes used by api.py and app.py.
+
+For each mode the upload is exposed through open_upload_path and the first
+30 frames are decoded with OpenCV, which is what classification does before
+running the model. Reports p50/p99 latency per mode.
+
+Usage:
+  python bench_upload_storage.py [video_path] [--runs 50] [--temp-dir /mnt/slow]
+"""
+
+import io
+import os
+import time
+import tempfile
+import argparse
+
+import cv2
+import numpy as np
+
+from upload_storage import open_upload_path, memfd_supported
+
+
+def make_synthetic_video(n_frames=90, size=(640, 360)):
+    """Write a small random MJPG clip and return its bytes"""
+    with tempfile.NamedTemporaryFile(suffix='.avi', delete=False) as tmpfile:
+        path = tmpfile.name
+    try:
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, size)
+        rng = np.random.default_rng(0)
+        for _ in range(n_frames):
+            writer.write(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8))
+        writer.release()
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.unlink(path)
+
+
+def decode_frames(path, n_frames=30):
+    src = cv2.VideoCapture(path)
+    count = 0
+    for _ in range(n_frames):
+        ret, _ = src.read()
+        if not ret:
+            break
+        count += 1
+    src.release()
+    return count
+
+
+def bench_mode(data, mode, runs, suffix, temp_dir):
+    timings = []
+    for _ in range(runs):
+        upload = io.BytesIO(data)
+        start = time.perf_counter()
+        with open_upload_path(upload, suffix=suffix, mode=mode, temp_dir=temp_dir) as path:
+            decoded = decode_frames(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    if decoded == 0:
+        print(f"  warning: no frames decoded in {mode} mode")
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark upload storage modes")
+    parser.add_argument('video', nargs='?', help="Video file to use (default: synthetic clip)")
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--temp-dir', default=None, help="Directory used by the disk mode")
+    args = parser.parse_args()
+
+    if args.video:
+        with open(args.video, 'rb') as f:
+            data = f.read()
+        suffix = os.path.splitext(args.video)[1] or '.mp4'
+    else:
+        data = make_synthetic_video()
+        suffix = '.avi'
+
+    print(f"Upload size: {len(data) / 1024 / 1024:.2f} MB, runs per mode: {args.runs}")
+    print(f"memfd available: {memfd_supported()}")
+    print("-" * 50)
+    for mode in ('disk', 'memory'):
+        p50, p99 = bench_mode(data, mode, args.runs, suffix, args.temp_dir)
+        print(f"{mode:8} | p50 {p50:8.2f} ms | p99 {p99:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Check that the hot API and scraper queries are served from indexes.
+
+Runs EXPLAIN on each query in HOT_QUERIES and fails if any plan contains a
+sequential scan on a table with at least --min-rows rows (per pg_class
+statistics). Small tables are ignored, since Postgres rightly prefers a
+sequential scan when a table fits in a page or two.
+
+Usage:
+  python check_query_plans.py [--min-rows 1000] [--verbose]
+"""
+
+import sys
+import json
+import argparse
+
+import psycopg2
+
+from migrations import DB_CONFIG
+from api_queries import (
+    STADIUM_AFTER_CURSOR, STADIUM_PITCH_TYPE, STADIUM_NAME_PREFIX, STADIUM_BY_ID_SQL, PLAYERS_BY_FORMAT_SQL,
+    SQUAD_STATS_SQL, PLAYER_STATS_SQL, SQUAD_SQL, PLAYER_PROFILE_SQL, STADIUM_SEARCH_SQL, PLAYER_SEARCH_SQL,
+    stadiums_sql, leaderboard_sql, player_profiles_sql,
+)
+
+STADIUM_COLUMNS = ['id', 'ground_name', 'pitch_type', 'pitch_description', 'url', 'scraped_at']
+
+# (name, sql, params) for every query the API or scrapers run on a hot path,
+# built from the same statements the endpoints execute
+HOT_QUERIES = [
+    ('stadiums first page', stadiums_sql(STADIUM_COLUMNS, [], True), (51,)),
+    ('stadiums next page', stadiums_sql(STADIUM_COLUMNS, [STADIUM_AFTER_CURSOR], True), ('M', 0, 51)),
+    ('stadiums by pitch_type', stadiums_sql(['id', 'ground_name', 'pitch_type'], [STADIUM_PITCH_TYPE], True), ('Batting', 51)),
+    ('stadiums by name prefix', stadiums_sql(['id', 'ground_name'], [STADIUM_NAME_PREFIX], True), ('lor%', 51)),
+    ('stadium by id', STADIUM_BY_ID_SQL, (1,)),
+    ('players by format', PLAYERS_BY_FORMAT_SQL, ('TEST',)),
+    ('whole squad', SQUAD_SQL, ('Pakistan', 'Pakistan')),
+    ('squad stats by format', SQUAD_STATS_SQL, ('TEST', 'TEST')),
+    ('player stats by name', PLAYER_STATS_SQL, ('Babar Azam', 'TEST', 'TEST', None, None)),
+    ('odi runs leaderboard', leaderboard_sql('batting', 'runs', 'DESC', False), ('ODI', 0, 10)),
+    ('t20i economy leaderboard', leaderboard_sql('bowling', 'economy', 'ASC', False), ('T20I', 0, 10)),
+    ('test bowling average leaderboard', leaderboard_sql('bowling', 'average', 'ASC', False), ('TEST', 0, 10)),
+    ('stadium search', STADIUM_SEARCH_SQL, {'q': 'gadafi stadium', 'limit': 10}),
+    ('player search', PLAYER_SEARCH_SQL, {'q': 'babr azam', 'limit': 10}),
+    ('player profiles by name', player_profiles_sql('player_name'), (['Babar Azam', 'Mohammad Rizwan'],)),
+    ('player profile by name', PLAYER_PROFILE_SQL, ('Babar Azam',)),
+]
+
+
+def find_seq_scans(plan):
+    """Yield the relation name of every Seq Scan node in an EXPLAIN (FORMAT JSON) plan"""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan.get('Relation Name')
+    for child in plan.get('Plans', []):
+        yield from find_seq_scans(child)
+
+
+def table_rows(cursor, table):
+    cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s AND relkind = 'r'", (table,))
+    row = cursor.fetchone()
+    return max(int(row[0]), 0) if row else 0
+
+
+def check_plans(conn, min_rows, verbose=False):
+    """Return a list of (query name, table, rows) for every offending sequential scan"""
+    failures = []
+    with conn.cursor() as cursor:
+        for name, sql, params in HOT_QUERIES:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            plan = plan[0]['Plan']
+            if verbose:
+                print(f"\n{name}:\n{json.dumps(plan, indent=2)}")
+            for table in find_seq_scans(plan):
+                rows = table_rows(cursor, table)
+                if rows >= min_rows:
+                    failures.append((name, table, rows))
+    conn.rollback()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail on sequential scans of large tables in hot queries")
+    parser.add_argument('--min-rows', type=int, default=1000, help="Tables smaller than this may be seq scanned")
+    parser.add_argument('--verbose', action='store_true', help="Print every plan")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        failures = check_plans(conn, args.min_rows, args.verbose)
+    finally:
+        conn.close()
+
+    for name, table, rows in failures:
+        print(f"[FAIL] {name}: sequential scan on {table} (~{rows} rows)")
+    if failures:
+        sys.exit(1)
+    print(f"[OK] {len(HOT_QUERIES)} hot queries use no sequential scans on tables with >= {args.min_rows} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,11 @@ import re
 from urllib.parse import urljoin, urlparse
 import logging
 
+from data_versions import bump_data_version
+from migrations import apply_migrations
+from stadium_countries import COUNTRY_SQL
+from summary_views import refresh_summary_views
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -41,20 +46,10 @@ class CricketStadiumScraper:
             return False
             
         try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS stadiums (
-                        id SERIAL PRIMARY KEY,
-                        ground_name VARCHAR(255) NOT NULL,
-                        pitch_type VARCHAR(50),
-                        pitch_description TEXT,
-                        url VARCHAR(500),
-                        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                conn.commit()
-                logger.info("Table created successfully")
-                return True
+            # The schema is owned by migrations.py
+            apply_migrations(conn)
+            logger.info("Table created successfully")
+            return True
         except Exception as e:
             logger.error(f"Error creating table: {e}")
             return False
@@ -180,16 +175,19 @@ class CricketStadiumScraper:
             
         try:
             with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO stadiums (ground_name, pitch_type, pitch_description, url)
-                    VALUES (%s, %s, %s, %s)
+                # Resolve the country from the gazetteer once, here, rather than in every report
+                cursor.execute(f"""
+                    INSERT INTO stadiums (ground_name, pitch_type, pitch_description, url, country)
+                    VALUES (%s, %s, %s, %s, {COUNTRY_SQL})
                     ON CONFLICT DO NOTHING
                 """, (
                     stadium_data['ground_name'],
                     stadium_data['pitch_type'],
                     stadium_data['pitch_description'],
-                    stadium_data['url']
+                    stadium_data['url'],
+                    stadium_data['ground_name']
                 ))
+                bump_data_version(cursor, 'stadiums')
                 conn.commit()
                 logger.info(f"Saved data for {stadium_data['ground_name']}")
                 return True
@@ -199,6 +197,21 @@ class CricketStadiumScraper:
         finally:
             conn.close()
     
+    def refresh_summaries(self):
+        """Rebuild the precomputed stadium aggregates read by the reports and the API"""
+        conn = self.get_db_connection()
+        if not conn:
+            return False
+            
+        try:
+            refresh_summary_views(conn, ['stadiums'])
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing summary views: {e}")
+            return False
+        finally:
+            conn.close()
+    
     def scrape_all_stadiums(self, main_url):
         """Main method to scrape all stadiums"""
         logger.info("Starting stadium scraping process...")
@@ -231,6 +244,7 @@ class CricketStadiumScraper:
             # Add delay to be respectful to the server
             time.sleep(2)
         
+        self.refresh_summaries()
         logger.info(f"Scraping completed. Successfully processed {success_count}/{len(stadium_urls)} stadiums")
         return True
 
@@ -0,0 +1,34 @@
+"""
+Per-table data versions written by the scrapers.
+
+Every scraper commit bumps its table's row in data_versions and sends a
+NOTIFY on DATA_CHANGED_CHANNEL whose payload is a JSON object with the
+table, its new version and updated_at as a Unix timestamp. Both happen in the
+scraper's own transaction, so readers only hear about data they can see.
+The table itself is created by migrations.py.
+"""
+
+DATA_CHANGED_CHANNEL = 'data_changed'
+
+# Tables the scrapers write, whose versions the API tracks
+VERSIONED_TABLES = ('stadiums', 'team_squad_players', 'player_profiles')
+
+
+def bump_data_version(cursor, table_name):
+    """Record a change to table_name; takes effect when the caller commits"""
+    cursor.execute("""
+        WITH bumped AS (
+            INSERT INTO data_versions (table_name, version, updated_at)
+            VALUES (%s, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT (table_name) DO UPDATE SET
+                version = data_versions.version + 1,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING table_name, version, updated_at
+        )
+        SELECT pg_notify(%s, json_build_object(
+            'table', table_name,
+            'version', version,
+            'updated_at', extract(epoch FROM updated_at)
+        )::text)
+        FROM bumped
+    """, (table_name, DATA_CHANGED_CHANNEL))
@@ -0,0 +1,103 @@
+import os
+import time
+import logging
+import weakref
+from typing import Any, Dict, List, Optional, Union
+
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row, tuple_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing and health checks, overridable from the environment
+POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 2))
+POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 5.0))
+POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30.0))
+
+__all__ = ['Database', 'PoolTimeout']
+
+# Positional (%s) or named (%(name)s) query parameters
+Params = Union[tuple, Dict[str, Any]]
+
+
+class Database:
+    """
+    Async data access over a psycopg 3 connection pool.
+
+    Queries run on the event loop without blocking it, so one slow query only
+    delays the request that issued it. Rows come back as dicts, with JSONB
+    decoded and timestamps as datetimes, exactly as the psycopg2 handlers
+    produced them. Connections idle for longer than health_check_interval are
+    pinged before being handed out and replaced if the server dropped them.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], min_size: int = POOL_MIN_SIZE, max_size: int = POOL_MAX_SIZE,
+                 timeout: float = POOL_TIMEOUT, health_check_interval: float = POOL_HEALTH_CHECK_INTERVAL):
+        self.health_check_interval = health_check_interval
+        self._returned_at = weakref.WeakKeyDictionary()
+        self._health_check_failures = 0
+        self.conninfo = make_conninfo(
+            host=db_config['host'],
+            dbname=db_config['database'],
+            user=db_config['user'],
+            password=db_config['password'],
+            port=db_config['port'],
+        )
+        self.pool = AsyncConnectionPool(
+            self.conninfo,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=timeout,
+            kwargs={'autocommit': True, 'row_factory': dict_row},
+            check=self._check,
+            reset=self._mark_returned,
+            open=False,
+        )
+
+    async def _mark_returned(self, conn):
+        self._returned_at[conn] = time.monotonic()
+
+    async def _check(self, conn):
+        """Ping connections that sat idle long enough for the server to have dropped them"""
+        returned_at = self._returned_at.get(conn)
+        if returned_at is not None and time.monotonic() - returned_at < self.health_check_interval:
+            return
+        try:
+            await conn.execute("SELECT 1")
+        except Exception:
+            self._health_check_failures += 1
+            raise
+
+    async def open(self):
+        await self.pool.open(wait=True)
+
+    async def close(self):
+        await self.pool.close()
+
+    async def fetch_all(self, query: str, params: Optional[Params] = None) -> List[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(query, params)
+            return await cursor.fetchall()
+
+    async def fetch_one(self, query: str, params: Optional[Params] = None) -> Optional[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cursor = await conn.execute(query, params)
+            return await cursor.fetchone()
+
+    async def fetch_value(self, query: str, params: Optional[Params] = None) -> Any:
+        """First column of the first row, e.g. a JSON document built in SQL as text"""
+        async with self.pool.connection() as conn:
+            cursor = conn.cursor(row_factory=tuple_row)
+            await cursor.execute(query, params)
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, wait and health-check counters"""
+        stats = self.pool.get_stats()
+        requests = stats.get('requests_num', 0)
+        stats['requests_wait_ms_avg'] = stats.get('requests_wait_ms', 0) / requests if requests else 0.0
+        stats['health_check_failures'] = self._health_check_failures
+        return stats
@@ -0,0 +1,228 @@
+"""
+On-disk cache of sentence embeddings keyed by (model name, sha256 of the text).
+
+embeddings_pipeline.py looks every chunk of row texts up here before calling
+model.encode, so rebuilding an index (say with another --index-type) or
+re-running after a scrape only encodes texts it has never seen.
+
+Each model has its own directory under the cache root holding:
+
+  vectors.f32   normalized float32 embeddings, one row per entry, memory-mapped
+  hashes.bin    the 32-byte sha256 digest of each entry's text, in the same order
+
+A digest's position in hashes.bin is its row in vectors.f32. Lookups go
+through a sorted copy of the digests, so a chunk of texts is resolved with
+one searchsorted. New entries are appended to both files, at the latest
+once FLUSH_ROWS of them are pending, so memory stays bounded on a cold
+cache and an interrupted build keeps what it encoded. Threads may share
+an EmbeddingCache, but only one process should write to a cache at a time.
+
+Usage:
+  python embedding_cache.py --compact [--out faiss_indexes] [--cache-dir DIR]
+      evict entries that no row in the --out manifests references
+  python embedding_cache.py --stats [--cache-dir DIR]
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+DIGEST = np.dtype("S32")
+
+# Rows copied per step when compacting
+COMPACT_CHUNK = 65536
+
+# New entries held in memory before put() appends them to disk
+FLUSH_ROWS = 8192
+
+
+def model_dir_name(model_name: str) -> str:
+    return model_name.replace("/", "__")
+
+
+class EmbeddingCache:
+    """Embeddings of one model, looked up by the sha256 hex digest of their text"""
+
+    def __init__(self, cache_dir: str, model_name: str, dimension: int):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.path = os.path.join(cache_dir, model_dir_name(model_name))
+        self.vectors_path = os.path.join(self.path, "vectors.f32")
+        self.hashes_path = os.path.join(self.path, "hashes.bin")
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, "cache.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["dimension"] != dimension:
+                raise ValueError(f"Cache {self.path} holds {meta['dimension']}-d vectors, model gives {dimension}-d")
+        else:
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model_name": model_name, "dimension": dimension}, f)
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[bytes, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        rows = os.path.getsize(self.hashes_path) // DIGEST.itemsize if os.path.exists(self.hashes_path) else 0
+        if os.path.exists(self.vectors_path):
+            rows = min(rows, os.path.getsize(self.vectors_path) // (4 * self.dimension))
+        else:
+            rows = 0
+        # An interrupted append can leave one file longer than the other. Cut both
+        # back to the last complete entry so the next append keeps them aligned.
+        for path, row_bytes in ((self.hashes_path, DIGEST.itemsize), (self.vectors_path, 4 * self.dimension)):
+            if os.path.exists(path) and os.path.getsize(path) != rows * row_bytes:
+                os.truncate(path, rows * row_bytes)
+        self.count = rows
+        if rows:
+            digests = np.fromfile(self.hashes_path, dtype=DIGEST, count=rows)
+            self._order = np.argsort(digests, kind="stable")
+            self._sorted = digests[self._order]
+            self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        else:
+            self._order = np.empty(0, dtype=np.int64)
+            self._sorted = np.empty(0, dtype=DIGEST)
+            self.vectors = np.empty((0, self.dimension), dtype=np.float32)
+
+    def get(self, hashes: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(found mask, vectors of the found hashes in order) for a list of hex digests"""
+        keys = np.array([bytes.fromhex(h) for h in hashes], dtype=DIGEST)
+        found = np.zeros(len(keys), dtype=bool)
+        vectors = np.empty((len(keys), self.dimension), dtype=np.float32)
+        with self._lock:
+            if len(self._sorted):
+                pos = np.minimum(np.searchsorted(self._sorted, keys), len(self._sorted) - 1)
+                hit = self._sorted[pos] == keys
+                found[hit] = True
+                vectors[hit] = self.vectors[self._order[pos[hit]]]
+            for i in np.flatnonzero(~found):
+                vector = self._pending.get(keys[i])
+                if vector is not None:
+                    found[i] = True
+                    vectors[i] = vector
+            self.hits += int(found.sum())
+            self.misses += int(len(keys) - found.sum())
+        return found, vectors[found]
+
+    def put(self, hashes: List[str], vectors: np.ndarray):
+        """
+        Add new entries; they are visible to get() at once and on disk after
+        flush(), which runs by itself once FLUSH_ROWS entries are pending
+        """
+        # Keyed like get() converts them: S32 drops trailing zero bytes
+        keys = np.array([bytes.fromhex(h) for h in hashes], dtype=DIGEST)
+        with self._lock:
+            for key, vector in zip(keys, np.asarray(vectors, dtype=np.float32)):
+                self._pending.setdefault(key, vector)
+            if len(self._pending) >= FLUSH_ROWS:
+                self._append_pending()
+
+    def flush(self):
+        with self._lock:
+            self._append_pending()
+
+    def _append_pending(self):
+        """Write the pending entries to disk and merge them into the lookup; the caller holds the lock"""
+        if not self._pending:
+            return
+        keys = np.array(list(self._pending), dtype=DIGEST)
+        with open(self.vectors_path, "ab") as f:
+            f.write(np.stack(list(self._pending.values())).astype(np.float32).tobytes())
+        with open(self.hashes_path, "ab") as f:
+            f.write(keys.tobytes())
+        # Insert the new digests into the sorted copy instead of sorting everything again
+        order = np.argsort(keys, kind="stable")
+        pos = np.searchsorted(self._sorted, keys[order])
+        self._sorted = np.insert(self._sorted, pos, keys[order])
+        self._order = np.insert(self._order, pos, self.count + order)
+        self.count += len(keys)
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dimension))
+        self._pending = {}
+
+    def compact(self, live_hashes) -> Tuple[int, int]:
+        """Rewrite the cache with only the entries whose hex digest is in live_hashes; returns (kept, evicted)"""
+        self.flush()
+        live = np.array(sorted(bytes.fromhex(h) for h in live_hashes), dtype=DIGEST)
+        digests = np.fromfile(self.hashes_path, dtype=DIGEST, count=self.count) if self.count else None
+        kept = 0
+        with open(self.vectors_path + ".tmp", "wb") as vectors_out, open(self.hashes_path + ".tmp", "wb") as hashes_out:
+            for start in range(0, self.count, COMPACT_CHUNK):
+                chunk = digests[start:start + COMPACT_CHUNK]
+                keep = np.isin(chunk, live)
+                vectors_out.write(np.asarray(self.vectors[start:start + COMPACT_CHUNK][keep]).tobytes())
+                hashes_out.write(chunk[keep].tobytes())
+                kept += int(keep.sum())
+        evicted = self.count - kept
+        self.vectors = None
+        os.replace(self.vectors_path + ".tmp", self.vectors_path)
+        os.replace(self.hashes_path + ".tmp", self.hashes_path)
+        self._load()
+        return kept, evicted
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "model_name": self.model_name,
+            "entries": self.count,
+            "bytes": self.count * (4 * self.dimension + DIGEST.itemsize),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def cached_models(cache_dir: str) -> List[Tuple[str, int]]:
+    """(model name, dimension) of every cache under cache_dir"""
+    models = []
+    if os.path.isdir(cache_dir):
+        for name in sorted(os.listdir(cache_dir)):
+            meta_path = os.path.join(cache_dir, name, "cache.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                models.append((meta["model_name"], meta["dimension"]))
+    return models
+
+
+def live_hashes(index_dir: str, model_name: str) -> set:
+    """Text hashes of every row in the index manifests built with model_name"""
+    hashes = set()
+    for name in sorted(os.listdir(index_dir)):
+        if name.endswith("_manifest.json"):
+            with open(os.path.join(index_dir, name), encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("model_name") == model_name:
+                hashes.update((manifest.get("row_hashes") or {}).values())
+    return hashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact or inspect the embedding cache")
+    parser.add_argument("--out", default="faiss_indexes", help="Directory of the index manifests")
+    parser.add_argument("--cache-dir", help="Cache root (default <out>/embedding_cache)")
+    parser.add_argument("--compact", action="store_true", help="Evict entries no indexed row references")
+    parser.add_argument("--stats", action="store_true")
+    args = parser.parse_args()
+    if not (args.compact or args.stats):
+        print(__doc__)
+        sys.exit(1)
+
+    cache_dir = args.cache_dir or os.path.join(args.out, "embedding_cache")
+    for model_name, dimension in cached_models(cache_dir):
+        cache = EmbeddingCache(cache_dir, model_name, dimension)
+        if args.compact:
+            kept, evicted = cache.compact(live_hashes(args.out, model_name))
+            print(f"[OK] {model_name}: kept {kept}, evicted {evicted}")
+        else:
+            stats = cache.stats()
+            print(f"{model_name}: {stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
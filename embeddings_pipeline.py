@@ -1,7 +1,10 @@
 import os
 import json
 import time
-from typing import Dict, List, Any, Tuple
+import hashlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 import numpy as np
 import psycopg2
@@ -10,6 +13,8 @@ from sentence_transformers import SentenceTransformer
 import faiss
 from tqdm import tqdm
 
+from embedding_cache import EmbeddingCache
+
 
 DEFAULT_DB_CONFIG = {
     "host": "localhost",
@@ -28,6 +33,20 @@ TABLE_ALIASES = {
 }
 
 
+# Index types selectable with --index-type, all searched by inner product on normalized vectors
+INDEX_TYPES = ("flat", "ivf-flat", "ivf-pq", "hnsw")
+
+# Options fixed when an index is built; nprobe and efSearch only affect search
+BUILD_OPTIONS = ("nlist", "pq_m", "pq_bits", "hnsw_m", "ef_construction")
+
+# k-means wants at least 39 points per centroid; train on up to 64
+MIN_POINTS_PER_CENTROID = 39
+TRAINING_POINTS_PER_CENTROID = 64
+
+# Seconds the watermark is moved back, for scrapes pg_stat_activity does not show
+WATERMARK_OVERLAP_SECONDS = 300
+
+
 def resolve_table_name(name: str) -> str:
     return TABLE_ALIASES.get(name, name)
 
@@ -42,12 +61,83 @@ def get_connection(db_config: Dict[str, Any]):
     )
 
 
-def fetch_rows(conn, table: str) -> Tuple[List[Dict[str, Any]], List[str]]:
-    with conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute(f"SELECT * FROM {table}")
-        rows = cur.fetchall()
-        columns = [desc.name for desc in cur.description]
-        return rows, columns
+def fetch_columns(conn, table: str) -> List[str]:
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT * FROM {table} LIMIT 0")
+        return [desc.name for desc in cur.description]
+
+
+def pk_column(columns: List[str]) -> Optional[str]:
+    # Prefer primary key column named 'id', else any column ending with 'id'
+    if "id" in columns:
+        return "id"
+    pk_cols = [c for c in columns if c.endswith("id")]
+    return pk_cols[0] if pk_cols else None
+
+
+def count_rows(conn, table: str) -> int:
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        return int(cur.fetchone()[0])
+
+
+def fetch_pks(conn, table: str, pk_col: str) -> List[int]:
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT {pk_col} FROM {table}")
+        return [int(row[0]) for row in cur.fetchall()]
+
+
+def db_watermark(conn, overlap: int = WATERMARK_OVERLAP_SECONDS) -> str:
+    """
+    Watermark for a build starting now, from the database clock.
+
+    Scrapers stamp scraped_at with NOW(), their transaction's start time, so a
+    scrape still open when the build reads can commit rows older than the
+    build. The watermark is therefore the start of the oldest open transaction
+    (or now), minus overlap for sessions pg_stat_activity does not show us.
+    Rows in the overlap are read again next time; their hashes match, so they
+    are not re-encoded.
+    """
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT (LEAST(now(), COALESCE(MIN(xact_start), now())) - make_interval(secs => %s))::timestamp
+            FROM pg_stat_activity
+            WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL
+            """,
+            (overlap,),
+        )
+        return cur.fetchone()[0].isoformat()
+
+
+def iter_rows(
+    conn,
+    table: str,
+    since: Optional[str] = None,
+    known_pks: Optional[List[int]] = None,
+    pk_col: str = "id",
+    itersize: int = 2000,
+    sample: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the table's rows through a server-side cursor, itersize rows per
+    round trip. With since/known_pks only the rows scraped at or after the
+    watermark plus any pk the previous build did not see; with sample, that
+    many rows picked at random.
+    """
+    with conn.cursor(name=f"embeddings_{table}", cursor_factory=RealDictCursor) as cur:
+        cur.itersize = itersize
+        if sample is not None:
+            cur.execute(f"SELECT * FROM {table} ORDER BY random() LIMIT %s", (sample,))
+        elif since is None:
+            cur.execute(f"SELECT * FROM {table}")
+        else:
+            cur.execute(
+                f"SELECT * FROM {table} WHERE scraped_at >= %s OR NOT ({pk_col} = ANY(%s))",
+                (since, known_pks or []),
+            )
+        for row in cur:
+            yield row
 
 
 def flatten_json(obj: Any) -> str:
@@ -133,62 +223,444 @@ def ensure_outdir(path: str):
     os.makedirs(path, exist_ok=True)
 
 
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def auto_nlist(n: int) -> int:
+    """About 4 * sqrt(n) inverted lists, with enough rows to train each centroid"""
+    return max(1, min(int(4 * np.sqrt(n)), n // MIN_POINTS_PER_CENTROID))
+
+
+def auto_pq_m(d: int) -> int:
+    """Largest number of sub-quantizers dividing d with at least 4 dimensions each"""
+    return max(m for m in range(1, d // 4 + 1) if d % m == 0) if d >= 4 else 1
+
+
+def index_config(
+    n: int,
+    d: int,
+    type: str = "flat",
+    nlist: Optional[int] = None,
+    nprobe: Optional[int] = None,
+    pq_m: Optional[int] = None,
+    pq_bits: Optional[int] = None,
+    hnsw_m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    ef_search: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    The factory string, parameters and training sample size of an index of
+    the given type over n vectors of dimension d. Unset options are chosen
+    from n and d. IVF types fall back to flat when n is too small to train
+    their centroids.
+    """
+    if type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {type}, expected one of: {', '.join(INDEX_TYPES)}")
+    flat = {"type": "flat", "factory": "IDMap,Flat", "search_params": {}, "training_rows": 0}
+
+    if type in ("ivf-flat", "ivf-pq"):
+        nlist = nlist or auto_nlist(n)
+        pq_bits = pq_bits or 8
+        centroids = max(nlist, 2 ** pq_bits if type == "ivf-pq" else 0)
+        if nlist < 2 or n < MIN_POINTS_PER_CENTROID * centroids:
+            return dict(flat, fallback_from=type)
+        config = {
+            "type": type,
+            "nlist": nlist,
+            "search_params": {"nprobe": min(nprobe or 8, nlist)},
+            "training_rows": min(n, TRAINING_POINTS_PER_CENTROID * centroids),
+        }
+        if type == "ivf-flat":
+            config["factory"] = f"IVF{nlist},Flat"
+        else:
+            config["pq_m"] = pq_m or auto_pq_m(d)
+            config["pq_bits"] = pq_bits
+            config["factory"] = f"IVF{nlist},PQ{config['pq_m']}x{pq_bits}"
+        return config
+
+    if type == "hnsw":
+        hnsw_m = hnsw_m or 32
+        return {
+            "type": "hnsw",
+            "factory": f"IDMap,HNSW{hnsw_m},Flat",
+            "hnsw_m": hnsw_m,
+            "ef_construction": ef_construction or 40,
+            "search_params": {"efSearch": ef_search or 64},
+            "training_rows": 0,
+        }
+
+    return flat
+
+
+def apply_search_params(index, params: Dict[str, Any]):
+    """Set nprobe / efSearch on an index, through any IDMap wrapper"""
+    if params:
+        faiss.ParameterSpace().set_index_parameters(index, ",".join(f"{k}={v}" for k, v in params.items()))
+
+
+def make_index(config: Dict[str, Any], d: int):
+    index = faiss.index_factory(d, config["factory"], faiss.METRIC_INNER_PRODUCT)
+    if config["type"] == "hnsw":
+        faiss.downcast_index(index.index).hnsw.efConstruction = config["ef_construction"]
+    apply_search_params(index, config["search_params"])
+    return index
+
+
+def load_manifest(
+    manifest_path: str,
+    model_name: str,
+    index_options: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """The previous build's manifest, if an incremental update can start from it"""
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    # Builds from before incremental mode have no hashes and sequential vector ids
+    if manifest.get("model_name") != model_name or "row_hashes" not in manifest:
+        return None
+    index_options = index_options or {}
+    built = manifest.get("index") or {}
+    # A fallback flat index is rebuilt until the table is large enough for the requested type
+    if built.get("type") != index_options.get("type", "flat") or "fallback_from" in built:
+        return None
+    if any(index_options.get(key) not in (None, built.get(key)) for key in BUILD_OPTIONS):
+        return None
+    # HNSW graphs cannot remove vectors, so they are always rebuilt
+    if built.get("type") == "hnsw":
+        return None
+    return manifest
+
+
+def encode_batch(model: SentenceTransformer, texts: List[str], batch_size: int = 64) -> np.ndarray:
+    embeddings = model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    return normalize(np.asarray(embeddings, dtype=np.float32))
+
+
+class LocalEncoder:
+    """Encodes in the calling thread; submit() returns an already finished future"""
+
+    def __init__(self, model: SentenceTransformer, batch_size: int = 64):
+        self.model = model
+        self.batch_size = batch_size
+        self.dimension = model.get_sentence_embedding_dimension()
+        self.workers = 0
+
+    def submit(self, texts: List[str]) -> Future:
+        future = Future()
+        future.set_result(encode_batch(self.model, texts, self.batch_size))
+        return future
+
+    def close(self):
+        pass
+
+
+# The model each ProcessEncoder worker loads once, in _init_encode_worker
+_worker_model = None
+
+
+def _init_encode_worker(model_name: str, threads: int):
+    global _worker_model
+    import torch
+
+    # Split the cores between workers instead of each one using all of them
+    torch.set_num_threads(threads)
+    _worker_model = SentenceTransformer(model_name)
+
+
+def _encode_in_worker(texts: List[str], batch_size: int) -> np.ndarray:
+    return encode_batch(_worker_model, texts, batch_size)
+
+
+def _worker_dimension() -> int:
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+class ProcessEncoder:
+    """
+    A pool of worker processes, each with its own copy of the model. submit()
+    returns at once, so callers keep fetching rows and writing finished chunks
+    while workers encode. Safe to share between the threads building tables.
+    """
+
+    def __init__(self, model_name: str, workers: int, batch_size: int = 64):
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        self.pool = ProcessPoolExecutor(workers, initializer=_init_encode_worker, initargs=(model_name, threads))
+        self.batch_size = batch_size
+        self.workers = workers
+        self.dimension = self.pool.submit(_worker_dimension).result()
+
+    def submit(self, texts: List[str]) -> Future:
+        return self.pool.submit(_encode_in_worker, texts, self.batch_size)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def submit_texts(encoder, texts: List[str], hashes: List[str], cache: Optional[EmbeddingCache] = None):
+    """Look texts up in the cache and send the misses to the encoder; finish with collect_texts"""
+    if cache is None:
+        found = np.zeros(len(texts), dtype=bool)
+        cached = np.empty((0, encoder.dimension), dtype=np.float32)
+    else:
+        found, cached = cache.get(hashes)
+    misses = np.flatnonzero(~found)
+    future = encoder.submit([texts[i] for i in misses]) if len(misses) else None
+    return found, cached, misses, hashes, future
+
+
+def collect_texts(pending, dimension: int, cache: Optional[EmbeddingCache] = None) -> np.ndarray:
+    """Normalized embeddings of the texts given to submit_texts, in order"""
+    found, cached, misses, hashes, future = pending
+    embeddings = np.empty((len(found), dimension), dtype=np.float32)
+    embeddings[found] = cached
+    if future is not None:
+        encoded = future.result()
+        embeddings[misses] = encoded
+        if cache is not None:
+            cache.put([hashes[i] for i in misses], encoded)
+    return embeddings
+
+
+def train_index(
+    conn,
+    index,
+    table: str,
+    columns: List[str],
+    encoder,
+    size: int,
+    cache: Optional[EmbeddingCache] = None,
+) -> int:
+    """Train an IVF index on the embeddings of size rows picked at random; returns the number encoded"""
+    texts = [row_to_text(table, row, columns) for row in iter_rows(conn, table, sample=size)]
+    pending = submit_texts(encoder, texts, [text_hash(text) for text in texts], cache)
+    index.train(collect_texts(pending, encoder.dimension, cache))
+    return len(pending[2])
+
+
+def copy_meta(meta_path: str, out, keep_pks: set):
+    """Copy the previous build's metadata records whose pk is in keep_pks, line by line"""
+    if not keep_pks or not os.path.exists(meta_path):
+        return
+    with open(meta_path, encoding="utf-8") as f:
+        for line in f:
+            if json.loads(line)["pk"] in keep_pks:
+                out.write(line)
+
+
+def finish_chunk(
+    index,
+    encoder,
+    chunk: List[Tuple[int, str, str]],
+    pending,
+    old_hashes: Dict[str, str],
+    table: str,
+    meta_out,
+    cache: Optional[EmbeddingCache] = None,
+):
+    """Swap one encoded chunk of (pk, text, text hash) into the index and append its metadata"""
+    embeddings = collect_texts(pending, encoder.dimension, cache)
+    replace = [pk for pk, _, _ in chunk if str(pk) in old_hashes]
+    if replace:
+        index.remove_ids(np.asarray(replace, dtype=np.int64))
+    index.add_with_ids(embeddings, np.asarray([pk for pk, _, _ in chunk], dtype=np.int64))
+    for pk, text, _ in chunk:
+        payload = {"vector_id": pk, "pk": pk, "table": table, "text": text}
+        meta_out.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
 def build_table_index(
     conn,
     table: str,
-    model: SentenceTransformer,
+    encoder,
     out_dir: str,
     model_name: str,
+    full: bool = False,
+    chunk_size: int = 1024,
+    itersize: int = 2000,
+    index_options: Optional[Dict[str, Any]] = None,
+    cache: Optional[EmbeddingCache] = None,
 ) -> Dict[str, Any]:
-    rows, columns = fetch_rows(conn, table)
-    if not rows:
-        return {"table": table, "count": 0, "index_path": None}
-
-    texts: List[str] = []
-    ids: List[int] = []
-    for row in rows:
-        # Prefer primary key column named 'id'
-        pk = row.get("id")
-        if pk is None:
-            # Try to find any column ending with 'id'
-            pk_cols = [c for c in columns if c.endswith("id")]
-            pk = row.get(pk_cols[0]) if pk_cols else None
-        ids.append(int(pk) if pk is not None else -1)
-        texts.append(row_to_text(table, row, columns))
-
-    embeddings = model.encode(texts, batch_size=64, show_progress_bar=True)
-    embeddings = np.asarray(embeddings, dtype=np.float32)
-    embeddings = normalize(embeddings)
-
-    index = faiss.IndexFlatIP(embeddings.shape[1])
-    index.add(embeddings)
-
-    ensure_outdir(out_dir)
+    """
+    Build or update one table's index.
+
+    index_options picks the index type and its parameters (see index_config);
+    IVF indexes are trained on a random sample of rows before any are added.
+    Vectors are keyed by row pk, natively in IVF indexes and through an
+    IndexIDMap for flat and HNSW. When a manifest from an earlier build with
+    the same model exists (and full is not set), only rows scraped since its
+    watermark (see db_watermark) or not yet indexed are read, and only those
+    whose text hash changed are encoded; they replace their old vectors with
+    remove_ids/add_with_ids, and pks no longer in the table are removed.
+
+    Rows stream from a server-side cursor and are encoded, added and written
+    to the metadata chunk_size at a time, so memory holds one chunk of rows,
+    texts and embeddings (plus the index and a hash per row) at any table size.
+
+    With a cache, texts embedded by any earlier build with this model are
+    read from it instead of being encoded again.
+
+    encoder is a LocalEncoder or a ProcessEncoder. With worker processes up
+    to two chunks per worker are in flight: the next rows are read and
+    hashed while earlier chunks encode, and chunks are added to the index
+    and written to the metadata in order as they come back.
+    """
     index_path = os.path.join(out_dir, f"{table}.index")
     meta_path = os.path.join(out_dir, f"{table}_meta.jsonl")
     manifest_path = os.path.join(out_dir, f"{table}_manifest.json")
 
-    faiss.write_index(index, index_path)
+    index_options = index_options or {}
+    manifest = None if full else load_manifest(manifest_path, model_name, index_options)
+    columns = fetch_columns(conn, table)
+    pk_col = pk_column(columns)
+    if pk_col is None:
+        raise ValueError(f"Table {table} has no id column to key its vectors by")
+    if manifest is not None and not os.path.exists(index_path):
+        manifest = None
+
+    old_hashes: Dict[str, str] = manifest["row_hashes"] if manifest else {}
+    watermark = manifest.get("watermark") if manifest else None
+    # Taken before any row is read; rows committed after it are picked up next run
+    next_watermark = db_watermark(conn) if "scraped_at" in columns else None
+    if manifest is not None and watermark and "scraped_at" in columns:
+        known = [int(pk) for pk in old_hashes]
+        rows = iter_rows(conn, table, since=watermark, known_pks=known, pk_col=pk_col, itersize=itersize)
+        live_pks = set(fetch_pks(conn, table, pk_col))
+    else:
+        rows = iter_rows(conn, table, itersize=itersize)
+        live_pks = None
+
+    started = time.perf_counter()
+    encoded = cache_hits = 0
+    if manifest is not None:
+        index = faiss.read_index(index_path)
+        config = dict(manifest["index"])
+        # nprobe only affects search, so a new value applies without a rebuild
+        if index_options.get("nprobe") and "nprobe" in config["search_params"]:
+            config["search_params"] = {"nprobe": min(index_options["nprobe"], config["nlist"])}
+    else:
+        config = index_config(count_rows(conn, table), encoder.dimension, **index_options)
+        if "fallback_from" in config:
+            print(f"  {table}: too few rows for {config['fallback_from']}, building a flat index")
+        index = make_index(config, encoder.dimension)
+        if not index.is_trained:
+            encoded += train_index(conn, index, table, columns, encoder, config["training_rows"], cache)
 
-    with open(meta_path, "w", encoding="utf-8") as f:
-        for i, (pk, text) in enumerate(zip(ids, texts)):
-            payload = {"vector_id": i, "pk": pk, "table": table, "text": text}
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    ensure_outdir(out_dir)
+    hashes: Dict[str, str] = {}
+    embedded_pks = set()
+    seen_pks = set()
+    new = changed = 0
+    chunk: List[Tuple[int, str, str]] = []
+    in_flight = deque()
+    max_in_flight = 2 * encoder.workers
+    progress = tqdm(desc=table, unit="rows")
+
+    def submit_chunk(chunk):
+        nonlocal encoded, cache_hits
+        pending = submit_texts(encoder, [text for _, text, _ in chunk], [h for _, _, h in chunk], cache)
+        encoded += len(pending[2])
+        cache_hits += len(chunk) - len(pending[2])
+        in_flight.append((chunk, pending))
+        while len(in_flight) > max_in_flight:
+            finish_oldest()
+
+    def finish_oldest():
+        done, pending = in_flight.popleft()
+        finish_chunk(index, encoder, done, pending, old_hashes, table, meta_out, cache)
+        embedded_pks.update(p for p, _, _ in done)
+        progress.update(len(done))
+
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as meta_out:
+        for row in rows:
+            pk = int(row[pk_col])
+            seen_pks.add(pk)
+            text = row_to_text(table, row, columns)
+            h = text_hash(text)
+            hashes[str(pk)] = h
+            if old_hashes.get(str(pk)) == h:
+                continue
+            if str(pk) in old_hashes:
+                changed += 1
+            else:
+                new += 1
+            chunk.append((pk, text, h))
+            if len(chunk) >= chunk_size:
+                submit_chunk(chunk)
+                chunk = []
+        if chunk:
+            submit_chunk(chunk)
+        while in_flight:
+            finish_oldest()
+        progress.close()
+        # End the read transaction the server-side cursor ran in
+        conn.rollback()
+
+        if live_pks is None:
+            live_pks = seen_pks
+        deleted = [int(pk) for pk in old_hashes if int(pk) not in live_pks]
+        if deleted:
+            index.remove_ids(np.asarray(deleted, dtype=np.int64))
+        # Rows the watermark let us skip keep their hash and metadata
+        kept = {int(pk) for pk in old_hashes if int(pk) in live_pks and int(pk) not in embedded_pks}
+        for pk in kept:
+            hashes.setdefault(str(pk), old_hashes[str(pk)])
+        copy_meta(meta_path, meta_out, kept)
+
+    if not live_pks and manifest is None:
+        os.remove(meta_path + ".tmp")
+        return {"table": table, "count": 0, "index_path": None}
 
+    # Replace rather than overwrite, the API may have the old files memory-mapped
+    os.replace(meta_path + ".tmp", meta_path)
+    faiss.write_index(index, index_path + ".tmp")
+    os.replace(index_path + ".tmp", index_path)
+
+    report = {
+        "new": new,
+        "changed": changed,
+        "deleted": len(deleted),
+        "embedded": len(embedded_pks),
+        "encoded": encoded,
+        "cache_hits": cache_hits,
+        "skipped": len(live_pks) - len(embedded_pks),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
     manifest = {
         "table": table,
-        "count": len(texts),
+        "count": int(index.ntotal),
         "index_path": index_path,
         "meta_path": meta_path,
         "model_name": model_name,
-        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-        "dimension": int(embeddings.shape[1]),
+        "created_at": manifest["created_at"] if manifest else time.strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "dimension": int(index.d),
         "metric": "cosine",
+        "index": config,
+        "watermark": next_watermark,
+        "last_run": report,
+        "row_hashes": hashes,
     }
     with open(manifest_path, "w", encoding="utf-8") as f:
         json.dump(manifest, f, ensure_ascii=False, indent=2)
 
-    return {"table": table, "count": len(texts), "index_path": index_path}
+    return {"table": table, "count": int(index.ntotal), "index_path": index_path, **report}
+
+
+def report_table(res: Dict[str, Any]):
+    if res["index_path"] is None:
+        print(f"{res['table']}: no rows")
+        return
+    rate = res["embedded"] / res["seconds"] if res["seconds"] else 0.0
+    print(
+        f"{res['table']}: {res['embedded']} re-embedded ({res['new']} new, {res['changed']} changed), "
+        f"{res['skipped']} skipped, {res['deleted']} deleted; index: {res['index_path']}"
+    )
+    print(
+        f"  -> {res['encoded']} texts encoded, {res['cache_hits']} read from the embedding cache; "
+        f"{res['seconds']:.1f}s, {rate:.0f} rows/sec"
+    )
 
 
 def build_embeddings(
@@ -196,7 +668,24 @@ def build_embeddings(
     tables: List[str] = None,
     out_dir: str = "faiss_indexes",
     model_name: str = "all-MiniLM-L6-v2",
+    full: bool = False,
+    chunk_size: int = 1024,
+    itersize: int = 2000,
+    index_options: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+    workers: int = 0,
+    batch_size: int = 64,
 ) -> List[Dict[str, Any]]:
+    """
+    Build or update the index of every table.
+
+    With workers = 0 the model runs in this process and tables are built one
+    after another. Otherwise one pool of that many encoding processes is
+    shared by all tables, which are built at the same time on their own
+    connections, so one table's reads and index writes overlap the others'
+    encoding.
+    """
     db_config = db_config or DEFAULT_DB_CONFIG
     tables = tables or [
         "team_squad_players",
@@ -206,18 +695,43 @@ def build_embeddings(
 
     resolved = [resolve_table_name(t) for t in tables]
 
-    model = SentenceTransformer(model_name)
-    conn = get_connection(db_config)
+    if workers > 0:
+        encoder = ProcessEncoder(model_name, workers, batch_size)
+    else:
+        encoder = LocalEncoder(SentenceTransformer(model_name), batch_size)
+    cache = None
+    if use_cache:
+        cache_dir = cache_dir or os.path.join(out_dir, "embedding_cache")
+        cache = EmbeddingCache(cache_dir, model_name, encoder.dimension)
+
+    def build(table: str) -> Dict[str, Any]:
+        conn = get_connection(db_config)
+        try:
+            res = build_table_index(
+                conn, table, encoder, out_dir, model_name,
+                full=full, chunk_size=chunk_size, itersize=itersize, index_options=index_options, cache=cache,
+            )
+        finally:
+            conn.close()
+        if cache is not None:
+            cache.flush()
+        report_table(res)
+        return res
+
+    started = time.perf_counter()
     try:
-        results = []
-        for t in resolved:
-            print(f"Building FAISS index for table: {t}")
-            res = build_table_index(conn, t, model, out_dir, model_name)
-            print(f"  -> {res['count']} rows embedded; index: {res['index_path']}")
-            results.append(res)
-        return results
+        print(f"Building FAISS indexes for: {', '.join(resolved)}")
+        if workers > 0:
+            with ThreadPoolExecutor(len(resolved)) as pool:
+                results = list(pool.map(build, resolved))
+        else:
+            results = [build(t) for t in resolved]
     finally:
-        conn.close()
+        encoder.close()
+    seconds = time.perf_counter() - started
+    embedded = sum(res.get("embedded", 0) for res in results)
+    print(f"Embedded {embedded} rows in {seconds:.1f}s ({embedded / seconds if seconds else 0.0:.0f} rows/sec)")
+    return results
 
 
 def main():
@@ -242,6 +756,45 @@ def main():
         default="faiss_indexes",
         help="Output directory for FAISS indexes",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-embed every row instead of updating the existing indexes",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1024,
+        help="Rows encoded and added to the index at a time",
+    )
+    parser.add_argument(
+        "--itersize",
+        type=int,
+        default=2000,
+        help="Rows fetched per round trip from the server-side cursor",
+    )
+    parser.add_argument(
+        "--index-type",
+        choices=INDEX_TYPES,
+        default="flat",
+        help="FAISS index type; tune_faiss_index.py compares them on your data",
+    )
+    parser.add_argument("--nlist", type=int, help="IVF inverted lists (default about 4 * sqrt(rows))")
+    parser.add_argument("--nprobe", type=int, help="IVF lists searched per query (default 8)")
+    parser.add_argument("--pq-m", type=int, help="IVF-PQ sub-quantizers (default dimension / 4)")
+    parser.add_argument("--pq-bits", type=int, help="IVF-PQ bits per sub-quantizer code (default 8)")
+    parser.add_argument("--hnsw-m", type=int, help="HNSW neighbours per node (default 32)")
+    parser.add_argument("--ef-construction", type=int, help="HNSW build-time search depth (default 40)")
+    parser.add_argument("--ef-search", type=int, help="HNSW query-time search depth (default 64)")
+    parser.add_argument("--cache-dir", help="Embedding cache directory (default <out>/embedding_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Encode every text instead of using the embedding cache")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Encoding processes shared by all tables, built in parallel (default 0: encode in this process)",
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per model.encode batch")
     args = parser.parse_args()
 
     results = build_embeddings(
@@ -249,11 +802,34 @@ def main():
         tables=args.tables,
         out_dir=args.out,
         model_name=args.model,
+        full=args.full,
+        chunk_size=args.chunk_size,
+        itersize=args.itersize,
+        index_options={
+            "type": args.index_type,
+            "nlist": args.nlist,
+            "nprobe": args.nprobe,
+            "pq_m": args.pq_m,
+            "pq_bits": args.pq_bits,
+            "hnsw_m": args.hnsw_m,
+            "ef_construction": args.ef_construction,
+            "ef_search": args.ef_search,
+        },
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        workers=args.workers,
+        batch_size=args.batch_size,
     )
 
     print("\nSummary:")
     for r in results:
-        print(f"- {r['table']}: {r['count']} vectors -> {r['index_path']}")
+        if r["index_path"] is None:
+            print(f"- {r['table']}: no rows")
+        else:
+            print(
+                f"- {r['table']}: {r['count']} vectors -> {r['index_path']} "
+                f"(re-embedded {r['embedded']}, skipped {r['skipped']}, deleted {r['deleted']})"
+            )
 
 
 if __name__ == "__main__":
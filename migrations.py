@@ -0,0 +1,283 @@
+"""
+Versioned schema migrations for cricket_db.
+
+Every table and index is created here. apply_migrations() runs the
+migrations that are not yet recorded in schema_migrations, each in its own
+transaction, under an advisory lock so concurrent scrapers cannot race each
+other. The first migrations use IF NOT EXISTS, so databases created before
+this module existed are adopted as they are.
+
+Usage:
+  python migrations.py            apply pending migrations
+  python migrations.py --status   list applied and pending migrations
+"""
+
+import sys
+import logging
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': 'cricket_db',
+    'user': 'postgres',
+    'password': 'admin123',
+    'port': 5432
+}
+
+# Arbitrary key for pg_advisory_xact_lock, shared by every process that migrates
+MIGRATION_LOCK_ID = 20240115
+
+# (version, description, statements) in the order they must be applied
+MIGRATIONS = [
+    (1, 'create stadiums', [
+        """
+        CREATE TABLE IF NOT EXISTS stadiums (
+            id SERIAL PRIMARY KEY,
+            ground_name VARCHAR(255) NOT NULL,
+            pitch_type VARCHAR(50),
+            pitch_description TEXT,
+            url VARCHAR(500),
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (2, 'create team_squad_players', [
+        """
+        CREATE TABLE IF NOT EXISTS team_squad_players (
+            id SERIAL PRIMARY KEY,
+            team_name VARCHAR(100) NOT NULL,
+            format VARCHAR(20) NOT NULL,
+            player_name VARCHAR(255) NOT NULL,
+            player_info TEXT,
+            additional_info TEXT,
+            player_link VARCHAR(500),
+            image_url VARCHAR(500),
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (team_name, format, player_name)
+        )
+        """,
+    ]),
+    (3, 'create player_profiles', [
+        """
+        CREATE TABLE IF NOT EXISTS player_profiles (
+            id SERIAL PRIMARY KEY,
+            player_name VARCHAR(255) NOT NULL,
+            profile_url VARCHAR(500) NOT NULL UNIQUE,
+            personal_info JSONB,
+            batting_stats JSONB,
+            bowling_stats JSONB,
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (4, 'create data_versions', [
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            table_name VARCHAR(100) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (5, 'index stadiums for keyset pagination and filters', [
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_ground_name_id ON stadiums (ground_name, id)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_pitch_type ON stadiums (pitch_type, ground_name, id)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_name_prefix ON stadiums (lower(ground_name) text_pattern_ops)",
+    ]),
+    (6, 'index player lookups and the squad join', [
+        "CREATE INDEX IF NOT EXISTS idx_player_profiles_player_name ON player_profiles (player_name)",
+        "CREATE INDEX IF NOT EXISTS idx_team_squad_players_format_name ON team_squad_players (format, player_name)",
+    ]),
+    (7, 'store data_versions.updated_at with its time zone for Last-Modified', [
+        "ALTER TABLE data_versions ALTER COLUMN updated_at TYPE TIMESTAMPTZ",
+    ]),
+    (8, 'create player_format_stats', [
+        """
+        CREATE TABLE IF NOT EXISTS player_format_stats (
+            profile_url VARCHAR(500) NOT NULL REFERENCES player_profiles (profile_url) ON DELETE CASCADE,
+            player_name VARCHAR(255) NOT NULL,
+            game_type VARCHAR(20) NOT NULL,
+            discipline VARCHAR(10) NOT NULL CHECK (discipline IN ('batting', 'bowling')),
+            matches INTEGER,
+            innings INTEGER,
+            runs INTEGER,
+            average DOUBLE PRECISION,
+            strike_rate DOUBLE PRECISION,
+            wickets INTEGER,
+            economy DOUBLE PRECISION,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (profile_url, game_type, discipline)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_player_format_stats_player ON player_format_stats (player_name, game_type)",
+        "CREATE INDEX IF NOT EXISTS idx_player_format_stats_game_type ON player_format_stats (game_type, discipline)",
+    ]),
+    (9, 'index player_format_stats for leaderboards', [
+        "CREATE INDEX IF NOT EXISTS idx_pfs_batting_runs ON player_format_stats (game_type, runs DESC, player_name) WHERE discipline = 'batting'",
+        "CREATE INDEX IF NOT EXISTS idx_pfs_batting_average ON player_format_stats (game_type, average DESC, player_name) WHERE discipline = 'batting'",
+        "CREATE INDEX IF NOT EXISTS idx_pfs_batting_strike_rate ON player_format_stats (game_type, strike_rate DESC, player_name) WHERE discipline = 'batting'",
+        "CREATE INDEX IF NOT EXISTS idx_pfs_bowling_wickets ON player_format_stats (game_type, wickets DESC, player_name) WHERE discipline = 'bowling'",
+        "CREATE INDEX IF NOT EXISTS idx_pfs_bowling_economy ON player_format_stats (game_type, economy ASC, player_name) WHERE discipline = 'bowling'",
+        "CREATE INDEX IF NOT EXISTS idx_pfs_bowling_average ON player_format_stats (game_type, average ASC, player_name) WHERE discipline = 'bowling'",
+    ]),
+    (10, 'full-text and trigram search over stadiums and player names', [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        # Generated columns stay current on every INSERT/UPDATE the scrapers make
+        """
+        ALTER TABLE stadiums ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(ground_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(pitch_description, '')), 'B')
+        ) STORED
+        """,
+        """
+        ALTER TABLE player_profiles ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', coalesce(player_name, ''))) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_search_vector ON stadiums USING GIN (search_vector)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_ground_name_trgm ON stadiums USING GIN (ground_name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_pitch_description_trgm ON stadiums USING GIN (pitch_description gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_player_profiles_search_vector ON player_profiles USING GIN (search_vector)",
+        "CREATE INDEX IF NOT EXISTS idx_player_profiles_player_name_trgm ON player_profiles USING GIN (player_name gin_trgm_ops)",
+    ]),
+    (11, 'stadium_gazetteer and an indexed stadiums.country', [
+        # Keywords matched against ground_name; the lowest priority wins when several match
+        """
+        CREATE TABLE IF NOT EXISTS stadium_gazetteer (
+            keyword VARCHAR(100) PRIMARY KEY,
+            country VARCHAR(50) NOT NULL,
+            priority INTEGER NOT NULL
+        )
+        """,
+        """
+        INSERT INTO stadium_gazetteer (keyword, country, priority) VALUES
+            ('india', 'India', 1), ('mumbai', 'India', 1), ('delhi', 'India', 1), ('bangalore', 'India', 1),
+            ('hyderabad', 'India', 1), ('kolkata', 'India', 1), ('chennai', 'India', 1), ('rajasthan', 'India', 1),
+            ('punjab', 'India', 1), ('gujarat', 'India', 1), ('uttar pradesh', 'India', 1), ('madhya pradesh', 'India', 1),
+            ('maharashtra', 'India', 1), ('karnataka', 'India', 1), ('tamil nadu', 'India', 1), ('west bengal', 'India', 1),
+            ('australia', 'Australia', 2), ('melbourne', 'Australia', 2), ('sydney', 'Australia', 2), ('perth', 'Australia', 2),
+            ('adelaide', 'Australia', 2), ('brisbane', 'Australia', 2),
+            ('england', 'England', 3), ('london', 'England', 3), ('manchester', 'England', 3), ('birmingham', 'England', 3),
+            ('nottingham', 'England', 3), ('leeds', 'England', 3), ('southampton', 'England', 3), ('lords', 'England', 3),
+            ('edgbaston', 'England', 3), ('old trafford', 'England', 3), ('trent bridge', 'England', 3), ('headingley', 'England', 3),
+            ('rose bowl', 'England', 3),
+            ('pakistan', 'Pakistan', 4), ('karachi', 'Pakistan', 4), ('lahore', 'Pakistan', 4), ('islamabad', 'Pakistan', 4),
+            ('rawalpindi', 'Pakistan', 4), ('multan', 'Pakistan', 4), ('gaddafi', 'Pakistan', 4),
+            ('sri lanka', 'Sri Lanka', 5), ('colombo', 'Sri Lanka', 5), ('galle', 'Sri Lanka', 5), ('kandy', 'Sri Lanka', 5),
+            ('pallekele', 'Sri Lanka', 5), ('premadasa', 'Sri Lanka', 5),
+            ('new zealand', 'New Zealand', 6), ('auckland', 'New Zealand', 6), ('wellington', 'New Zealand', 6), ('christchurch', 'New Zealand', 6),
+            ('nelson', 'New Zealand', 6), ('mount maunganui', 'New Zealand', 6),
+            ('south africa', 'South Africa', 7), ('cape town', 'South Africa', 7), ('johannesburg', 'South Africa', 7), ('durban', 'South Africa', 7),
+            ('pretoria', 'South Africa', 7), ('newlands', 'South Africa', 7), ('wanderers', 'South Africa', 7), ('supersport', 'South Africa', 7),
+            ('bangladesh', 'Bangladesh', 8), ('dhaka', 'Bangladesh', 8), ('chittagong', 'Bangladesh', 8), ('chowdhury', 'Bangladesh', 8),
+            ('uae', 'UAE', 9), ('dubai', 'UAE', 9), ('abu dhabi', 'UAE', 9), ('zayed', 'UAE', 9),
+            ('usa', 'USA', 10), ('america', 'USA', 10), ('texas', 'USA', 10), ('nassau', 'USA', 10),
+            ('west indies', 'West Indies', 11), ('trinidad', 'West Indies', 11), ('barbados', 'West Indies', 11), ('jamaica', 'West Indies', 11),
+            ('queens park', 'West Indies', 11)
+        ON CONFLICT (keyword) DO NOTHING
+        """,
+        "ALTER TABLE stadiums ADD COLUMN IF NOT EXISTS country VARCHAR(50)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_country ON stadiums (country, pitch_type)",
+    ]),
+    (12, 'materialized summary views for reports and /stats/summary', [
+        # Refreshed CONCURRENTLY by summary_views.py, which needs a unique index on each view
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS stadium_summary AS
+        SELECT COALESCE(country, 'Other') AS country, pitch_type, COUNT(*) AS stadiums
+        FROM stadiums
+        GROUP BY 1, 2
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_stadium_summary_key ON stadium_summary (country, pitch_type)",
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS squad_summary AS
+        SELECT team_name, format, COUNT(*) AS players, MAX(scraped_at) AS last_scraped
+        FROM team_squad_players
+        GROUP BY team_name, format
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_squad_summary_key ON squad_summary (team_name, format)",
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS profile_summary AS
+        SELECT game_type, discipline, COUNT(*) AS players, SUM(matches) AS matches
+        FROM player_format_stats
+        GROUP BY game_type, discipline
+        """,
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_profile_summary_key ON profile_summary (game_type, discipline)",
+    ]),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migrations(conn):
+    """
+    Apply every pending migration on a psycopg2 connection.
+
+    Returns the list of versions applied by this call. A failing migration is
+    rolled back and re-raised; the ones before it stay applied.
+    """
+    applied = []
+    with conn.cursor() as cursor:
+        ensure_migrations_table(cursor)
+    conn.commit()
+
+    for version, description, statements in MIGRATIONS:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                # Another process may have applied it while we waited for the lock
+                if version in applied_versions(cursor):
+                    conn.rollback()
+                    continue
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                    (version, description),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error("Migration %d (%s) failed", version, description)
+            raise
+        logger.info("Applied migration %d: %s", version, description)
+        applied.append(version)
+    return applied
+
+
+def print_status(conn):
+    with conn.cursor() as cursor:
+        ensure_migrations_table(cursor)
+        conn.commit()
+        done = applied_versions(cursor)
+    for version, description, _ in MIGRATIONS:
+        state = "applied" if version in done else "pending"
+        print(f"  {version:3d}  {state:8}  {description}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        if '--status' in sys.argv:
+            print_status(conn)
+        else:
+            applied = apply_migrations(conn)
+            print(f"[OK] Applied {len(applied)} migration(s), schema is at version {MIGRATIONS[-1][0]}")
+    finally:
+        conn.close()
@@ -7,6 +7,10 @@ from psycopg2.extras import execute_batch
 import requests
 from bs4 import BeautifulSoup
 
+from data_versions import bump_data_version
+from summary_views import refresh_summary_views
+from migrations import apply_migrations
+
 logger = logging.getLogger(__name__)
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -54,22 +58,8 @@ class PakistanSquadScraper:
             return False
 
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    'CREATE TABLE IF NOT EXISTS team_squad_players ('
-                    ' id SERIAL PRIMARY KEY,'
-                    ' team_name VARCHAR(100) NOT NULL,'
-                    ' format VARCHAR(20) NOT NULL,'
-                    ' player_name VARCHAR(255) NOT NULL,'
-                    ' player_info TEXT,'
-                    ' additional_info TEXT,'
-                    ' player_link VARCHAR(500),'
-                    ' image_url VARCHAR(500),'
-                    ' scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,'
-                    ' UNIQUE (team_name, format, player_name)'
-                    ')'
-                )
-            conn.commit()
+            # The schema is owned by migrations.py
+            apply_migrations(conn)
             logger.info('Ensured team_squad_players table exists')
             return True
         except Exception as exc:
@@ -263,6 +253,7 @@ class PakistanSquadScraper:
 
                     execute_batch(cursor, upsert_query, values)
 
+                bump_data_version(cursor, 'team_squad_players')
             conn.commit()
             logger.info('Squad data saved successfully')
             return True
@@ -273,6 +264,20 @@ class PakistanSquadScraper:
         finally:
             conn.close()
 
+    def refresh_summaries(self) -> bool:
+        conn = self.get_db_connection()
+        if not conn:
+            return False
+
+        try:
+            refresh_summary_views(conn, ['team_squad_players'])
+            return True
+        except Exception as exc:
+            logger.error('Error refreshing summary views: %s', exc)
+            return False
+        finally:
+            conn.close()
+
     def scrape_and_store(self) -> bool:
         if not self.create_table():
             return False
@@ -286,7 +291,11 @@ class PakistanSquadScraper:
             logger.error('Parsed squad data is empty')
             return False
 
-        return self.save_to_database(squads)
+        if not self.save_to_database(squads):
+            return False
+
+        self.refresh_summaries()
+        return True
 
 
 def main():
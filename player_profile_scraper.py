@@ -8,6 +8,11 @@ from psycopg2.extras import Json, execute_batch
 import requests
 from bs4 import BeautifulSoup
 
+from data_versions import bump_data_version
+from summary_views import refresh_summary_views
+from migrations import apply_migrations
+from player_stats import save_player_stats
+
 
 logger = logging.getLogger(__name__)
 if not logging.getLogger().handlers:
@@ -56,21 +61,8 @@ class PlayerProfileScraper:
             return False
 
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS player_profiles (
-                        id SERIAL PRIMARY KEY,
-                        player_name VARCHAR(255) NOT NULL,
-                        profile_url VARCHAR(500) NOT NULL UNIQUE,
-                        personal_info JSONB,
-                        batting_stats JSONB,
-                        bowling_stats JSONB,
-                        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                    """
-                )
-            conn.commit()
+            # The schema is owned by migrations.py
+            apply_migrations(conn)
             logger.info("Ensured player_profiles table exists")
             return True
         except Exception as exc:
@@ -238,8 +230,10 @@ class PlayerProfileScraper:
                         for profile in profiles
                     ],
                 )
+                stats_count = save_player_stats(cursor, profiles)
+                bump_data_version(cursor, 'player_profiles')
             conn.commit()
-            logger.info("Saved %d player profiles", len(profiles))
+            logger.info("Saved %d player profiles and %d per-format stats rows", len(profiles), stats_count)
             return True
         except Exception as exc:
             conn.rollback()
@@ -248,6 +242,20 @@ class PlayerProfileScraper:
         finally:
             conn.close()
 
+    def refresh_summaries(self) -> bool:
+        conn = self.get_db_connection()
+        if not conn:
+            return False
+
+        try:
+            refresh_summary_views(conn, ["player_profiles"])
+            return True
+        except Exception as exc:
+            logger.error("Error refreshing summary views: %s", exc)
+            return False
+        finally:
+            conn.close()
+
     # ------------------------------------------------------------------
     # Orchestration
     # ------------------------------------------------------------------
@@ -270,7 +278,11 @@ class PlayerProfileScraper:
                 logger.error("Failed to scrape %s", player["profile_url"])
             time.sleep(self.delay_seconds)
 
-        return self.save_profiles(scraped)
+        if not self.save_profiles(scraped):
+            return False
+
+        self.refresh_summaries()
+        return True
 
 
 def main():
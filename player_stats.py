@@ -0,0 +1,134 @@
+"""
+Typed per-format player stats derived from the scraped profile tables.
+
+PlayerProfileScraper stores each profile's batting and bowling tables as JSONB
+arrays of string-valued dicts keyed by header text ("Game Type", "Mat", "R",
+"Avg", "S/R", "W", "E/R", ...). This module turns them into rows of the
+player_format_stats table: one row per player, game type and discipline, with
+numeric columns, so the API can pick a format with an indexed lookup.
+
+Usage:
+  python player_stats.py --backfill   rebuild player_format_stats from player_profiles
+"""
+
+import sys
+import logging
+from typing import Dict, List, Optional
+
+import psycopg2
+from psycopg2.extras import execute_batch
+
+from data_versions import bump_data_version
+from migrations import DB_CONFIG, apply_migrations
+from summary_views import refresh_summary_views
+
+logger = logging.getLogger(__name__)
+
+# Game Type headers as scraped, mapped to the names the squads use
+GAME_TYPES = {
+    'TESTS': 'TEST',
+    'ODIS': 'ODI',
+    'T20IS': 'T20I',
+    'T20S': 'T20',
+    'LISTAS': 'LISTA',
+    'FIRSTCLASS': 'FIRSTCLASS',
+}
+
+INSERT_STATS_SQL = """
+    INSERT INTO player_format_stats (
+        profile_url, player_name, game_type, discipline,
+        matches, innings, runs, average, strike_rate, wickets, economy
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def normalize_game_type(value: Optional[str]) -> Optional[str]:
+    """'TESTs' -> 'TEST', 'test' -> 'TEST', 'ODIs' -> 'ODI'; unknown types are upper-cased"""
+    if not value:
+        return None
+    key = value.strip().upper()
+    return GAME_TYPES.get(key, GAME_TYPES.get(key + 'S', key))
+
+
+def parse_number(value) -> Optional[float]:
+    """Numeric value of a stats cell, or None for blanks and dashes. '158*' -> 158.0"""
+    if value is None:
+        return None
+    text = str(value).strip().rstrip('*').replace(',', '')
+    if not text or text in ('-', '--', 'N/A'):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_int(value) -> Optional[int]:
+    number = parse_number(value)
+    return None if number is None else int(number)
+
+
+def stats_rows(profile: Dict[str, object]) -> List[tuple]:
+    """Rows of player_format_stats for one scraped profile"""
+    rows = []
+    for discipline, key in (('batting', 'batting_stats'), ('bowling', 'bowling_stats')):
+        seen = set()
+        for entry in profile.get(key) or []:
+            game_type = normalize_game_type(entry.get('Game Type'))
+            if not game_type or game_type in seen:
+                continue
+            seen.add(game_type)
+            rows.append((
+                profile['profile_url'],
+                profile['player_name'],
+                game_type,
+                discipline,
+                parse_int(entry.get('Mat')),
+                parse_int(entry.get('Inn')),
+                parse_int(entry.get('R')),
+                parse_number(entry.get('Avg')),
+                parse_number(entry.get('S/R')) if discipline == 'batting' else None,
+                parse_int(entry.get('W')) if discipline == 'bowling' else None,
+                parse_number(entry.get('E/R')) if discipline == 'bowling' else None,
+            ))
+    return rows
+
+
+def save_player_stats(cursor, profiles: List[Dict[str, object]]):
+    """Replace the typed stats of the given profiles; runs in the caller's transaction"""
+    cursor.execute(
+        "DELETE FROM player_format_stats WHERE profile_url = ANY(%s)",
+        ([profile['profile_url'] for profile in profiles],),
+    )
+    rows = [row for profile in profiles for row in stats_rows(profile)]
+    if rows:
+        execute_batch(cursor, INSERT_STATS_SQL, rows)
+    return len(rows)
+
+
+def backfill(conn) -> int:
+    """Rebuild player_format_stats for every stored profile"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT player_name, profile_url, batting_stats, bowling_stats FROM player_profiles")
+        profiles = [
+            {'player_name': name, 'profile_url': url, 'batting_stats': batting, 'bowling_stats': bowling}
+            for name, url, batting, bowling in cursor.fetchall()
+        ]
+        count = save_player_stats(cursor, profiles) if profiles else 0
+        bump_data_version(cursor, 'player_profiles')
+    conn.commit()
+    return count
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if '--backfill' not in sys.argv:
+        print(__doc__)
+        sys.exit(1)
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        apply_migrations(conn)
+        print(f"[OK] Wrote {backfill(conn)} player_format_stats rows")
+        refresh_summary_views(conn, ['player_profiles'])
+    finally:
+        conn.close()
@@ -0,0 +1,209 @@
+"""
+Semantic search over the FAISS indexes written by embeddings_pipeline.py.
+
+Each table's index is memory-mapped rather than read into the heap, and its
+metadata is packed into flat arrays (sorted vector ids, pks and one UTF-8
+text blob with offsets) instead of a dict per row. Query encoding goes
+through QueryEncoder, which keeps the SentenceTransformer loaded and encodes
+requests that arrive together as one batch.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from embeddings_pipeline import apply_search_params, resolve_table_name
+
+logger = logging.getLogger(__name__)
+
+# Where the pipeline writes its indexes, and how long the encoder waits to fill a batch
+INDEX_DIR = os.environ.get('SEMANTIC_INDEX_DIR', 'faiss_indexes')
+ENCODE_BATCH_WINDOW = float(os.environ.get('SEMANTIC_ENCODE_BATCH_WINDOW_MS', 5.0)) / 1000
+ENCODE_MAX_BATCH = int(os.environ.get('SEMANTIC_ENCODE_MAX_BATCH', 64))
+
+
+def read_index_mmap(path: str):
+    """Memory-map an index file, falling back to a normal read for index types that cannot be mapped"""
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        logger.warning("Cannot memory-map %s, reading it into memory", path)
+        return faiss.read_index(path)
+
+
+class TableIndex:
+    """One table's FAISS index and its id -> (pk, text) metadata"""
+
+    def __init__(self, manifest_path: str):
+        with open(manifest_path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.table = self.manifest['table']
+        self.model_name = self.manifest['model_name']
+        # Resolve the files next to the manifest, wherever the pipeline ran from
+        base_dir = os.path.dirname(manifest_path)
+        self.index = read_index_mmap(os.path.join(base_dir, os.path.basename(self.manifest['index_path'])))
+        # nprobe / efSearch chosen at build time for IVF and HNSW indexes
+        apply_search_params(self.index, (self.manifest.get('index') or {}).get('search_params'))
+        self._load_meta(os.path.join(base_dir, os.path.basename(self.manifest['meta_path'])))
+
+    def _load_meta(self, meta_path: str):
+        vector_ids, pks, offsets, chunks = [], [], [0], []
+        with open(meta_path, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                text = record['text'].encode('utf-8')
+                vector_ids.append(record['vector_id'])
+                pks.append(record['pk'])
+                chunks.append(text)
+                offsets.append(offsets[-1] + len(text))
+        order = np.argsort(np.asarray(vector_ids, dtype=np.int64), kind='stable')
+        self.vector_ids = np.asarray(vector_ids, dtype=np.int64)[order]
+        self.pks = np.asarray(pks, dtype=np.int64)[order]
+        starts = np.asarray(offsets[:-1], dtype=np.int64)
+        ends = np.asarray(offsets[1:], dtype=np.int64)
+        self.text_starts, self.text_ends = starts[order], ends[order]
+        self.texts = b''.join(chunks)
+
+    def record(self, vector_id: int) -> Optional[Dict[str, Any]]:
+        pos = int(np.searchsorted(self.vector_ids, vector_id))
+        if pos >= len(self.vector_ids) or self.vector_ids[pos] != vector_id:
+            return None
+        text = self.texts[self.text_starts[pos]:self.text_ends[pos]].decode('utf-8')
+        return {'table': self.table, 'pk': int(self.pks[pos]), 'text': text}
+
+    def search(self, query_vector: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        scores, ids = self.index.search(query_vector.reshape(1, -1), k)
+        results = []
+        for score, vector_id in zip(scores[0], ids[0]):
+            if vector_id < 0:
+                continue
+            record = self.record(int(vector_id))
+            if record is not None:
+                record['score'] = float(score)
+                results.append(record)
+        return results
+
+
+class QueryEncoder:
+    """
+    A warm SentenceTransformer shared by all requests.
+
+    encode() queues the text; a single worker drains the queue, waiting up to
+    ENCODE_BATCH_WINDOW for more requests, and encodes each batch in one call
+    on a worker thread so the event loop keeps serving.
+    """
+
+    def __init__(self, model_name: str, batch_window: float = ENCODE_BATCH_WINDOW, max_batch: int = ENCODE_MAX_BATCH):
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.encoded = 0
+        self._queue = None
+        self._worker = None
+        # Warm up so the first request does not pay for lazy initialisation
+        self.model.encode(["warm up"], normalize_embeddings=True)
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._worker:
+            self._worker.cancel()
+
+    async def encode(self, text: str) -> np.ndarray:
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(
+                    None, lambda: self.model.encode(texts, batch_size=len(texts), normalize_embeddings=True)
+                )
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.encoded += len(texts)
+            for (_, future), vector in zip(batch, np.asarray(vectors, dtype=np.float32)):
+                if not future.done():
+                    future.set_result(vector)
+
+
+class SemanticSearch:
+    """All table indexes found in index_dir, plus one warm encoder per model they use"""
+
+    def __init__(self, index_dir: str = INDEX_DIR):
+        self.tables = {}
+        for name in sorted(os.listdir(index_dir)):
+            if name.endswith('_manifest.json'):
+                table_index = TableIndex(os.path.join(index_dir, name))
+                self.tables[table_index.table] = table_index
+        if not self.tables:
+            raise FileNotFoundError(f"No FAISS manifests found in {index_dir}")
+        self.encoders = {
+            model_name: QueryEncoder(model_name)
+            for model_name in {table_index.model_name for table_index in self.tables.values()}
+        }
+
+    def start(self):
+        for encoder in self.encoders.values():
+            encoder.start()
+
+    def stop(self):
+        for encoder in self.encoders.values():
+            encoder.stop()
+
+    async def search(self, query: str, table: Optional[str] = None, k: int = 10) -> List[Dict[str, Any]]:
+        if table:
+            table = resolve_table_name(table)
+            if table not in self.tables:
+                raise KeyError(table)
+            targets = [self.tables[table]]
+        else:
+            targets = list(self.tables.values())
+
+        loop = asyncio.get_event_loop()
+        vectors = {}
+        results = []
+        for table_index in targets:
+            if table_index.model_name not in vectors:
+                vectors[table_index.model_name] = await self.encoders[table_index.model_name].encode(query)
+            vector = vectors[table_index.model_name]
+            results.extend(await loop.run_in_executor(None, table_index.search, vector, k))
+        return sorted(results, key=lambda result: result['score'], reverse=True)[:k]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'tables': {name: int(table_index.index.ntotal) for name, table_index in self.tables.items()},
+            'encoders': {
+                name: {'batches': encoder.batches, 'encoded': encoder.encoded}
+                for name, encoder in self.encoders.items()
+            },
+        }
@@ -1,6 +1,8 @@
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
+from migrations import apply_migrations
+
 def create_database():
     """Create the cricket_db database if it doesn't exist"""
     try:
@@ -32,7 +34,7 @@ def create_database():
         return False
 
 def create_table():
-    """Create the stadiums table"""
+    """Create or upgrade every table by applying pending migrations"""
     try:
         conn = psycopg2.connect(
             host='localhost',
@@ -42,19 +44,8 @@ def create_table():
             port=5432
         )
         
-        with conn.cursor() as cursor:
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS stadiums (
-                    id SERIAL PRIMARY KEY,
-                    ground_name VARCHAR(255) NOT NULL,
-                    pitch_type VARCHAR(50),
-                    pitch_description TEXT,
-                    url VARCHAR(500),
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
-            print("[OK] Table 'stadiums' created successfully")
+        applied = apply_migrations(conn)
+        print(f"[OK] Schema up to date ({len(applied)} migration(s) applied)")
         
         conn.close()
         return True
@@ -0,0 +1,162 @@
+import cv2
+import logging
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import models, layers
+from tensorflow.keras.applications import EfficientNetB0
+from tensorflow.keras.applications.efficientnet import preprocess_input
+
+logger = logging.getLogger(__name__)
+
+# Define class labels
+classes = {
+    'cover': 0, 
+    'defense': 1, 
+    'flick': 2, 
+    'hook': 3, 
+    'late_cut': 4, 
+    'lofted': 5, 
+    'pull': 6, 
+    'square_cut': 7, 
+    'straight': 8, 
+    'sweep': 9
+}
+
+# Function to load the model
+def load_model(weights_path):
+    base_model = EfficientNetB0(include_top=False, weights='imagenet', input_shape=(224, 224, 3))
+
+    # Set the base model as non-trainable
+    base_model.trainable = False
+
+    # Define the full model using a Sequential model - matching the original saved weights (5 layers)
+    model = models.Sequential([
+        # Apply EfficientNetB0 to each frame of the video
+        layers.TimeDistributed(base_model, input_shape=(None, 224, 224, 3)),
+        layers.TimeDistributed(layers.GlobalAveragePooling2D()),
+
+        # Use GRU layers to capture temporal relationships
+        layers.GRU(256, return_sequences=True),
+        layers.GRU(128),
+
+        # Dense layers for classification
+        layers.Dense(1024, activation='relu'),
+        layers.Dropout(0.5),
+        layers.Dense(10, activation='softmax')
+    ])
+    
+    model.load_weights(weights_path)
+    return model
+
+def format_frames(frame, output_size):
+    """
+    Pad and resize an image from a video and apply proper preprocessing.
+
+    Args:
+      frame: Image that needs to resized and padded.
+      output_size: Pixel size of the output frame image.
+
+    Return:
+      Formatted frame with padding of specified output size, properly preprocessed.
+    """
+    # Convert to float32 for processing
+    frame = tf.image.convert_image_dtype(frame, tf.float32)
+    # Resize with padding
+    frame = tf.image.resize_with_pad(frame, *output_size)
+    # Scale to [0, 255] range (EfficientNetB0 expects this)
+    frame = frame * 255.0
+    # Apply EfficientNetB0 preprocessing
+    frame = preprocess_input(frame)
+    return frame.numpy()
+
+def frames_from_video_file(video_path, n_frames, output_size=(224, 224), frame_step=1):
+    """
+    Extracts frames sequentially from the start of the video file, with a specified step between frames.
+
+    Args:
+      video_path: File path to the video.
+      n_frames: Number of frames to be created per video file.
+      output_size: Pixel size of the output frame image (height, width).
+      frame_step: Number of frames to skip between extracted frames.
+
+    Returns:
+      A NumPy array of frames in the shape of (n_frames, height, width, channels).
+    """
+    result = []
+    src = cv2.VideoCapture(str(video_path))
+
+    src.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Start from the first frame
+
+    # Attempt to read the first frame
+    ret, frame = src.read()
+    if ret:
+        frame = format_frames(frame, output_size)
+        result.append(frame)
+    else:
+        # If the first frame can't be read, append a zero frame and exit
+        result.append(np.zeros((output_size[0], output_size[1], 3), dtype=np.uint8))
+
+    # Read subsequent frames with the specified frame_step
+    for _ in range(n_frames - 1):
+        for _ in range(frame_step):
+            ret, frame = src.read()
+        if ret:
+            frame = format_frames(frame, output_size)
+            result.append(frame)
+        else:
+            # Append a zero-like frame if no more frames can be read
+            result.append(np.zeros_like(result[0]))
+
+    src.release()
+
+    # Convert the list of frames to a NumPy array and adjust color channels from BGR to RGB
+    result = np.array(result)[..., [2, 1, 0]]
+
+    return result
+
+# Function to build a model that returns class probabilities and embeddings in one forward pass
+def build_inference_model(model):
+    # layers[-3] is the 1024-d Dense layer feeding the classifier (Dropout is inactive at inference)
+    # layers[1] is the per-frame pooled backbone feature sequence used for frame alignment
+    return tf.keras.Model(
+        inputs=model.input,
+        outputs=[model.output, model.layers[-3].output, model.layers[1].output]
+    )
+
+# Function to classify video
+def classify_video(video_path, inference_model, frame_count, class_labels):
+    # Process the video file to get the frames
+    frames = frames_from_video_file(video_path, frame_count)
+    return classify_frames(frames, inference_model, class_labels)
+
+# Function to classify already decoded frames
+def classify_frames(frames, inference_model, class_labels):
+    # Add batch dimension if the model expects it
+    frames = np.expand_dims(frames, axis=0)
+
+    # A single forward pass yields the class probabilities and the similarity features
+    predictions, embeddings, frame_features = inference_model.predict(frames)
+    logger.debug("Raw predictions: %s", predictions)
+
+    # Convert predictions to class labels
+    predicted_class_idx = np.argmax(predictions, axis=1)[0]  # Get the index of the max class score
+    
+    # Get the class name using the predicted index
+    predicted_class_name = list(class_labels.keys())[list(class_labels.values()).index(predicted_class_idx)]
+    
+    # Calculate the confidence percentage of the predicted class
+    confidence = predictions[0][predicted_class_idx] * 100  # Assuming softmax output, multiply by 100 for percentage
+    logger.debug("Predicted %s with confidence %.2f%%", predicted_class_name, confidence)
+
+    return predicted_class_name, confidence, embeddings[0], frame_features[0], predictions[0]
+
+# Function to list the k most likely classes with their confidence percentages
+def top_predictions(probabilities, class_labels, k=3):
+    top_indices = np.argsort(probabilities)[-k:][::-1]  # Indices of the top k in descending order
+    return [
+        {
+            'shotType': list(class_labels.keys())[list(class_labels.values()).index(idx)],
+            'confidence': round(float(probabilities[idx] * 100), 2)
+        }
+        for idx in top_indices
+    ]
@@ -0,0 +1,105 @@
+import numpy as np
+
+
+def cosine_similarity(embedding1, embedding2):
+    """Cosine similarity of two pooled embeddings (0.0 if either is all zeros)"""
+    norm = np.linalg.norm(embedding1) * np.linalg.norm(embedding2)
+    if norm == 0:
+        return 0.0
+    return float(np.dot(embedding1, embedding2) / norm)
+
+
+def cosine_distance_matrix(seq_a, seq_b):
+    """
+    Pairwise cosine distances between the frames of two feature sequences.
+
+    Args:
+      seq_a: Array of shape (n, d) with one feature vector per frame.
+      seq_b: Array of shape (m, d).
+
+    Returns:
+      Array of shape (n, m) with values in [0, 2].
+    """
+    a = np.asarray(seq_a, dtype=np.float32)
+    b = np.asarray(seq_b, dtype=np.float32)
+    a = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return np.clip(1.0 - a @ b.T, 0.0, 2.0)
+
+
+def band_mask(n, m, band=None):
+    """
+    Sakoe-Chiba band of allowed cells for an n x m alignment.
+
+    The band follows the diagonal from (0, 0) to (n - 1, m - 1), so clips of
+    different lengths are still fully reachable. A band of None allows every cell.
+    """
+    if band is None:
+        return np.ones((n, m), dtype=bool)
+    rows = np.arange(n)[:, None] * ((m - 1) / max(n - 1, 1))
+    cols = np.arange(m)[None, :]
+    return np.abs(rows - cols) <= max(band, 1)
+
+
+def dtw(cost, band=None):
+    """
+    Dynamic time warping over a cost matrix.
+
+    The accumulated cost is filled one anti-diagonal at a time, so each step is a
+    single vectorized NumPy operation and the Python loop runs n + m times.
+    Cells outside the band are never reachable.
+
+    Args:
+      cost: Array of shape (n, m) of frame-to-frame distances.
+      band: Optional Sakoe-Chiba radius (in frames of the second sequence).
+
+    Returns:
+      Tuple of (total_cost, path) where path is an int array of shape (L, 2)
+      holding the aligned (i, j) frame indices from start to end.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    n, m = cost.shape
+
+    # Store everything skewed by anti-diagonal (row k = i + j, column i) so each
+    # step below reads and writes contiguous slices instead of gathering cells
+    rows, cols = np.nonzero(band_mask(n, m, band))
+    skewed_cost = np.full((n + m + 1, n + 1), np.inf)
+    skewed_cost[rows + cols + 2, rows + 1] = cost[rows, cols]
+
+    acc = np.full((n + m + 1, n + 1), np.inf)
+    acc[0, 0] = 0.0
+    for k in range(2, n + m + 1):
+        lo, hi = max(1, k - m), min(n, k - 1) + 1
+        best = np.minimum(np.minimum(acc[k - 1, lo - 1:hi - 1], acc[k - 1, lo:hi]), acc[k - 2, lo - 1:hi - 1])
+        acc[k, lo:hi] = skewed_cost[k, lo:hi] + best
+
+    total_cost = acc[n + m, n]
+    if not np.isfinite(total_cost):
+        raise ValueError("No alignment exists within the given band")
+
+    # Walk back from the end along the cheapest predecessors
+    path = [(n - 1, m - 1)]
+    i, j = n, m
+    while i > 1 or j > 1:
+        i, j = min(((i - 1, j - 1), (i - 1, j), (i, j - 1)), key=lambda step: acc[step[0] + step[1], step[0]])
+        path.append((i - 1, j - 1))
+    return float(total_cost), np.array(path[::-1], dtype=np.int64)
+
+
+def shot_similarity(frames_a, frames_b, band=None):
+    """
+    Similarity of two shots after aligning their per-frame backbone features.
+
+    The score is the mean cosine similarity of the aligned frame pairs, so the
+    same shot played at a different tempo still scores close to 1.
+
+    Args:
+      frames_a: Per-frame features of the first clip, shape (n, d).
+      frames_b: Per-frame features of the second clip, shape (m, d).
+      band: Optional Sakoe-Chiba radius limiting how far the alignment may drift.
+
+    Returns:
+      Tuple of (score, path) where path is the (i, j) frame alignment.
+    """
+    total_cost, path = dtw(cosine_distance_matrix(frames_a, frames_b), band)
+    return 1.0 - total_cost / len(path), path
@@ -0,0 +1,64 @@
+"""
+Country of each stadium, resolved once from the stadium_gazetteer table.
+
+The gazetteer maps city and venue keywords ("lahore", "edgbaston", ...) to a
+country. CricketStadiumScraper stores the match in stadiums.country when it
+inserts a row, so reports can GROUP BY an indexed column instead of running
+a chain of ILIKE patterns over every ground name. Stadiums that match no
+keyword keep a NULL country and are reported as 'Other'.
+
+Usage:
+  python stadium_countries.py --backfill   resolve stadiums.country for every stored stadium
+"""
+
+import sys
+import logging
+
+import psycopg2
+
+from data_versions import bump_data_version
+from migrations import DB_CONFIG, apply_migrations
+from summary_views import refresh_summary_views
+
+logger = logging.getLogger(__name__)
+
+# Country for the ground name bound to %s; the lowest priority wins when several keywords match
+COUNTRY_SQL = """
+    (SELECT g.country FROM stadium_gazetteer g
+     WHERE strpos(lower(%s), g.keyword) > 0
+     ORDER BY g.priority, g.keyword
+     LIMIT 1)
+"""
+
+BACKFILL_SQL = """
+    UPDATE stadiums s SET country = (
+        SELECT g.country FROM stadium_gazetteer g
+        WHERE strpos(lower(s.ground_name), g.keyword) > 0
+        ORDER BY g.priority, g.keyword
+        LIMIT 1
+    )
+"""
+
+
+def backfill(conn) -> int:
+    """Resolve stadiums.country for every stored stadium, e.g. after editing the gazetteer"""
+    with conn.cursor() as cursor:
+        cursor.execute(BACKFILL_SQL)
+        count = cursor.rowcount
+        bump_data_version(cursor, 'stadiums')
+    conn.commit()
+    return count
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if '--backfill' not in sys.argv:
+        print(__doc__)
+        sys.exit(1)
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        apply_migrations(conn)
+        print(f"[OK] Resolved the country of {backfill(conn)} stadiums")
+        refresh_summary_views(conn, ['stadiums'])
+    finally:
+        conn.close()
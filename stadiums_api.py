@@ -1,10 +1,51 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import psycopg2
+from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel
+import orjson
 import os
-from typing import List, Dict, Any
+import json
+import asyncio
+import hashlib
+from email.utils import formatdate, parsedate_to_datetime
+import base64
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Literal, Optional
+from db_pool import Database, PoolTimeout
+from api_cache import DataVersions, ResponseCache, listen_for_changes
+from player_stats import normalize_game_type
+from api_queries import (
+    STADIUM_AFTER_CURSOR, STADIUM_PITCH_TYPE, STADIUM_NAME_PREFIX, STADIUM_BY_ID_SQL, PLAYERS_BY_FORMAT_SQL,
+    STAT_COLUMNS, SQUAD_STATS_SQL, PLAYER_STATS_SQL, SQUAD_SQL, PLAYER_PROFILE_SQL,
+    STADIUM_SEARCH_SQL, PLAYER_SEARCH_SQL, stadiums_sql, leaderboard_sql, player_profiles_sql,
+)
+from summary_views import SUMMARY_VIEWS, STADIUM_SUMMARY_SQL, SQUAD_SUMMARY_SQL, PROFILE_SUMMARY_SQL, stadium_breakdown
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the pool, change listener and semantic search at startup; close them at shutdown"""
+    global cache_listener, semantic
+    await db.open()
+    print(f"Database pool ready (min={db.pool.min_size}, max={db.pool.max_size})")
+    cache_listener = asyncio.ensure_future(listen_for_changes(db.conninfo, cache, versions))
+    try:
+        # Optional: needs faiss, sentence-transformers and built indexes
+        from semantic_search import SemanticSearch
+        semantic = await asyncio.get_event_loop().run_in_executor(None, SemanticSearch)
+        semantic.start()
+        print(f"Semantic search ready for tables: {', '.join(semantic.tables)}")
+    except Exception as e:
+        print(f"Semantic search disabled: {e}")
+    try:
+        yield
+    finally:
+        cache_listener.cancel()
+        if semantic:
+            semantic.stop()
+        await db.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -13,8 +54,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the pagination cursor and the revalidation headers
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+# Compress large bodies (stadium lists, squads, JSONB stats) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Database configuration
 DB_CONFIG = {
     'host': 'localhost',
@@ -24,100 +70,216 @@ DB_CONFIG = {
     'port': 5432
 }
 
-def get_db_connection():
-    """Create and return a database connection"""
+# Columns /stadiums can return and its page size bounds
+STADIUM_FIELDS = ('id', 'ground_name', 'pitch_type', 'pitch_description', 'url', 'scraped_at')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Most profiles /player-profiles returns per request
+MAX_BATCH_PROFILES = 200
+
+def encode_cursor(ground_name: str, stadium_id: int) -> str:
+    """Opaque keyset cursor pointing just after (ground_name, id)"""
+    return base64.urlsafe_b64encode(json.dumps([ground_name, stadium_id]).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
-        raise
+        ground_name, stadium_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(ground_name), int(stadium_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_stadium_fields(fields: Optional[str]) -> List[str]:
+    """
+    Columns to select for a fields= value. ground_name and id are always
+    selected because the next cursor is built from them.
+    """
+    if not fields:
+        return list(STADIUM_FIELDS)
+    requested = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in requested if name not in STADIUM_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in STADIUM_FIELDS if name in requested or name in ('id', 'ground_name')]
+
+def escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Send an already serialized JSON body, bypassing jsonable_encoder"""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def validators_for(key, tables) -> Dict[str, str]:
+    """
+    ETag and Last-Modified for a response read from tables, derived from the
+    tables' data versions. Empty when the versions are not known. The ETag is
+    weak because GZipMiddleware compresses the body after it is computed, so
+    the gzip and identity representations share it.
+    """
+    state = versions.state(tables)
+    if state is None:
+        return {}
+    token, modified = state
+    etag = hashlib.sha1(f"{key!r}|{token}".encode()).hexdigest()
+    return {"ETag": f'W/"{etag}"', "Last-Modified": formatdate(modified, usegmt=True)}
+
+def is_not_modified(request: Request, validators: Dict[str, str]) -> bool:
+    """True if the client's copy matches, per If-None-Match (weak comparison) or else If-Modified-Since"""
+    if not validators:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or validators["ETag"][2:] in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(validators["Last-Modified"]) <= since
+    return False
+
+def not_modified_response(validators: Dict[str, str]) -> Response:
+    # GZipMiddleware skips empty bodies, so add the Vary header it puts on the 200 responses
+    return Response(status_code=304, headers={**validators, "Vary": "Accept-Encoding"})
+
+async def cached_json(key, tables, loader) -> Optional[bytes]:
+    """
+    Serialized query result from the cache, loading and encoding it with orjson
+    on a miss. Cache hits skip the query and serialization both. A loader
+    returning None (nothing found) is cached as None.
+    """
+    async def load():
+        value = await loader()
+        return None if value is None else orjson.dumps(value)
+    return await cache.get_or_load(key, tables, load)
+
+# Async connection pool shared by all handlers, opened when the app starts
+db = Database(DB_CONFIG)
+
+# Query results, dropped when a scraper commits to a table they were read from,
+# and the table versions their ETag / Last-Modified validators come from
+cache = ResponseCache()
+versions = DataVersions()
+cache_listener = None
+
+# FAISS indexes from embeddings_pipeline.py, loaded at startup when present
+semantic = None
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request, exc):
+    print(f"Error connecting to database: {exc}")
+    return JSONResponse(status_code=503, content={"detail": "Database busy, please retry"})
 
 @app.get("/")
 async def root():
     return {"message": "Cricket Stadiums API"}
 
+@app.get("/pool/stats")
+async def get_pool_stats() -> Dict[str, Any]:
+    """Connection pool size, wait and health-check counters"""
+    return db.stats()
+
+@app.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """Response cache size, hit/miss, eviction and invalidation counters"""
+    return cache.stats()
+
 @app.get("/stadiums")
-async def get_stadiums() -> List[Dict[str, Any]]:
-    """Fetch all stadiums from the database"""
+async def get_stadiums(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    pitch_type: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Response:
+    """
+    Fetch stadiums ordered by (ground_name, id).
+
+    Without limit or cursor every matching stadium is returned, as before
+    pagination existed. Paging is opt-in: pass limit (or a cursor, which
+    defaults it to DEFAULT_PAGE_SIZE) and send the X-Next-Cursor response
+    header back as ?cursor= to get the next page; the header is absent on the
+    last page. fields= is a comma-separated subset of the stadium columns to
+    return.
+    """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Execute query to fetch stadiums
-        cursor.execute("""
-            SELECT id, ground_name, pitch_type, pitch_description, url, scraped_at 
-            FROM stadiums 
-            ORDER BY ground_name
-        """)
-        
-        # Fetch all rows
-        rows = cursor.fetchall()
-        
-        # Get column names
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Convert rows to list of dictionaries
-        stadiums = []
-        for row in rows:
-            stadium = dict(zip(columns, row))
-            stadiums.append(stadium)
-        
-        # Close connections
-        cursor.close()
-        conn.close()
-        
-        return stadiums
+        if limit is None and cursor:
+            limit = DEFAULT_PAGE_SIZE
+        columns = parse_stadium_fields(fields)
+        conditions, params = [], []
+        if cursor:
+            conditions.append(STADIUM_AFTER_CURSOR)
+            params.extend(decode_cursor(cursor))
+        if pitch_type:
+            conditions.append(STADIUM_PITCH_TYPE)
+            params.append(pitch_type)
+        if name_prefix:
+            conditions.append(STADIUM_NAME_PREFIX)
+            params.append(escape_like(name_prefix.lower()) + '%')
+
+        async def load_page():
+            # Fetch one extra row to know whether another page follows
+            rows = await db.fetch_all(
+                stadiums_sql(columns, conditions, limit is not None),
+                (*params, limit + 1) if limit else tuple(params),
+            )
+
+            stadiums = rows[:limit] if limit else rows
+            next_cursor = None
+            if limit and len(rows) > limit:
+                last = stadiums[-1]
+                next_cursor = encode_cursor(last['ground_name'], last['id'])
+
+            # Drop the cursor columns again if they were not asked for
+            if fields:
+                requested = {name.strip() for name in fields.split(',')}
+                stadiums = [{k: v for k, v in row.items() if k in requested} for row in stadiums]
+            return orjson.dumps(stadiums), next_cursor
+
+        cache_key = ('stadiums', tuple(columns), fields, tuple(conditions), tuple(params), limit)
+        validators = validators_for(cache_key, ['stadiums'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+        body, next_cursor = await cache.get_or_load(cache_key, ['stadiums'], load_page)
+        if next_cursor:
+            validators["X-Next-Cursor"] = next_cursor
+        return json_response(body, validators)
         
+    except (HTTPException, PoolTimeout):
+        raise
     except Exception as e:
         print(f"Error fetching stadiums: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching stadiums: {str(e)}")
 
 @app.get("/stadiums/{stadium_id}")
-async def get_stadium(stadium_id: int) -> Dict[str, Any]:
+async def get_stadium(stadium_id: int, request: Request) -> Response:
     """Fetch a specific stadium by ID"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+        validators = validators_for(('stadium', stadium_id), ['stadiums'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
         # Execute query to fetch specific stadium
-        cursor.execute("""
-            SELECT id, ground_name, pitch_type, pitch_description, url, scraped_at 
-            FROM stadiums 
-            WHERE id = %s
-        """, (stadium_id,))
-        
-        # Fetch the row
-        row = cursor.fetchone()
+        stadium = await cached_json(('stadium', stadium_id), ['stadiums'], lambda: db.fetch_one(STADIUM_BY_ID_SQL, (stadium_id,)))
         
-        # Close connections
-        cursor.close()
-        conn.close()
-        
-        if not row:
+        if not stadium:
             raise HTTPException(status_code=404, detail="Stadium not found")
         
-        # Get column names
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Convert row to dictionary
-        stadium = dict(zip(columns, row))
+        return json_response(stadium, validators)
         
-        return stadium
-        
-    except HTTPException:
+    except (HTTPException, PoolTimeout):
         raise
     except Exception as e:
         print(f"Error fetching stadium: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching stadium: {str(e)}")
 
 @app.get("/players/{format}")
-async def get_players_by_format(format: str) -> List[Dict[str, Any]]:
+async def get_players_by_format(format: str, request: Request) -> Response:
     """Fetch players by match format from team_squad_players and player_profiles"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # Normalize format to match database (TEST, ODI, T20I)
         format_map = {
             'test': 'TEST',
@@ -129,85 +291,331 @@ async def get_players_by_format(format: str) -> List[Dict[str, Any]]:
             'TEST': 'TEST'
         }
         db_format = format_map.get(format, format.upper())
+        validators = validators_for(('players', db_format), ['team_squad_players', 'player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
         
-        # Execute query to fetch players by format and their profiles
-        cursor.execute("""
-            SELECT 
-                pp.id,
-                tsp.player_name,
-                tsp.player_info,
-                tsp.player_link,
-                tsp.image_url,
-                pp.personal_info,
-                pp.batting_stats,
-                pp.bowling_stats,
-                pp.profile_url,
-                pp.scraped_at
-            FROM team_squad_players tsp
-            LEFT JOIN player_profiles pp ON tsp.player_name = pp.player_name
-            WHERE tsp.format = %s
-            ORDER BY tsp.player_name
-            LIMIT 15
-        """, (db_format,))
-        
-        # Fetch all rows
-        rows = cursor.fetchall()
+        async def load_players():
+            # Execute query to fetch players by format and their profiles
+            rows = await db.fetch_all(PLAYERS_BY_FORMAT_SQL, (db_format,))
+            
+            # Convert rows to list of dictionaries
+            players = []
+            for idx, player in enumerate(rows):
+                # Add an id if not present
+                if not player.get('id'):
+                    player['id'] = idx + 1
+                players.append(player)
+            return players
         
-        # Get column names
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Convert rows to list of dictionaries
-        players = []
-        for idx, row in enumerate(rows):
-            player = dict(zip(columns, row))
-            # Add an id if not present
-            if not player.get('id'):
-                player['id'] = idx + 1
-            players.append(player)
-        
-        # Close connections
-        cursor.close()
-        conn.close()
-        
-        return players
+        players = await cached_json(('players', db_format), ['team_squad_players', 'player_profiles'], load_players)
+        return json_response(players, validators)
         
+    except (HTTPException, PoolTimeout):
+        raise
     except Exception as e:
         print(f"Error fetching players by format: {e}")
         raise HTTPException(status_code=500, detail=f"Error fetching players: {str(e)}")
 
+@app.get("/players/{format}/stats")
+async def get_players_stats_by_format(format: str, request: Request) -> Response:
+    """
+    Batting and bowling stats in this format for every player in its squad,
+    read from the typed player_format_stats table (null where none exist).
+    """
+    try:
+        game_type = normalize_game_type(format)
+        validators = validators_for(('players-stats', game_type), ['team_squad_players', 'player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        async def load_stats():
+            rows = await db.fetch_all(SQUAD_STATS_SQL, (game_type, game_type))
+
+            players = {}
+            for row in rows:
+                player = players.setdefault(row['player_name'], {
+                    'player_name': row['player_name'], 'game_type': game_type, 'batting': None, 'bowling': None,
+                })
+                if row['discipline']:
+                    player[row['discipline']] = {column: row[column] for column in STAT_COLUMNS}
+            return list(players.values())
+
+        stats = await cached_json(('players-stats', game_type), ['team_squad_players', 'player_profiles'], load_stats)
+        return json_response(stats, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching player stats by format: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching player stats: {str(e)}")
+
+@app.get("/player-stats/{player_name}")
+async def get_player_stats(
+    player_name: str,
+    request: Request,
+    format: Optional[str] = None,
+    discipline: Optional[Literal['batting', 'bowling']] = None,
+) -> Response:
+    """Typed per-format stats rows of one player, optionally for one format and discipline"""
+    try:
+        game_type = normalize_game_type(format)
+        key = ('player-stats', player_name, game_type, discipline)
+        validators = validators_for(key, ['player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        stats = await cached_json(key, ['player_profiles'], lambda: db.fetch_all(
+            PLAYER_STATS_SQL, (player_name, game_type, game_type, discipline, discipline)
+        ))
+        return json_response(stats, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching player stats: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching player stats: {str(e)}")
+
+# Leaderboard metric -> (discipline, player_format_stats column, better direction)
+LEADERBOARD_METRICS = {
+    'runs': ('batting', 'runs', 'DESC'),
+    'average': ('batting', 'average', 'DESC'),
+    'strike_rate': ('batting', 'strike_rate', 'DESC'),
+    'wickets': ('bowling', 'wickets', 'DESC'),
+    'economy': ('bowling', 'economy', 'ASC'),
+    'bowling_average': ('bowling', 'average', 'ASC'),
+}
+
+@app.get("/leaderboards/{format}/{metric}")
+async def get_leaderboard(
+    format: str,
+    metric: str,
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    min_matches: int = Query(0, ge=0),
+    squad_only: bool = False,
+) -> Response:
+    """
+    Players ranked by one stat in one format, e.g. /leaderboards/odi/runs.
+
+    Ranked in Postgres over the indexed player_format_stats table. Players who
+    never batted (or bowled) in the format are left out, and bowling_average
+    also leaves out bowlers without a wicket. squad_only restricts
+    the ranking to the format's current squad.
+    """
+    try:
+        if metric not in LEADERBOARD_METRICS:
+            raise HTTPException(status_code=404, detail=f"Unknown metric, expected one of: {', '.join(LEADERBOARD_METRICS)}")
+        discipline, column, direction = LEADERBOARD_METRICS[metric]
+        game_type = normalize_game_type(format)
+        key = ('leaderboard', game_type, metric, limit, min_matches, squad_only)
+        validators = validators_for(key, ['team_squad_players', 'player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        async def load_leaderboard():
+            leaders = await db.fetch_all(
+                leaderboard_sql(discipline, column, direction, squad_only), (game_type, min_matches, limit)
+            )
+            return {
+                'format': game_type,
+                'metric': metric,
+                'discipline': discipline,
+                'leaders': leaders,
+            }
+
+        leaderboard = await cached_json(key, ['team_squad_players', 'player_profiles'], load_leaderboard)
+        return json_response(leaderboard, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching leaderboard: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching leaderboard: {str(e)}")
+
+SEARCH_TYPES = {
+    'stadiums': (STADIUM_SEARCH_SQL, 'stadiums'),
+    'players': (PLAYER_SEARCH_SQL, 'player_profiles'),
+}
+
+@app.get("/search")
+async def search(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200),
+    type: Literal['all', 'stadiums', 'players'] = 'all',
+    limit: int = Query(10, ge=1, le=50),
+) -> Response:
+    """
+    Ranked full-text and fuzzy search over stadium names and pitch
+    descriptions and player names. Misspellings match through trigram
+    similarity; snippets wrap the matched terms in <mark>.
+    """
+    try:
+        kinds = list(SEARCH_TYPES) if type == 'all' else [type]
+        tables = [SEARCH_TYPES[kind][1] for kind in kinds]
+        # Matching ignores case, so queries differing only in case share one cached body
+        query = q.strip().lower()
+        key = ('search', query, type, limit)
+        validators = validators_for(key, tables)
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        async def load_results():
+            params = {'q': query, 'limit': limit}
+            found = await asyncio.gather(*(db.fetch_all(SEARCH_TYPES[kind][0], params) for kind in kinds))
+            results = sorted((row for rows in found for row in rows), key=lambda row: row['score'], reverse=True)
+            return {'query': query, 'results': results[:limit]}
+
+        results = await cached_json(key, tables, load_results)
+        return json_response(results, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error searching: {e}")
+        raise HTTPException(status_code=500, detail=f"Error searching: {str(e)}")
+
+@app.get("/semantic-search")
+async def semantic_search(
+    q: str = Query(..., min_length=1, max_length=500),
+    table: Optional[str] = None,
+    k: int = Query(10, ge=1, le=100),
+) -> Response:
+    """
+    Nearest rows to the query by embedding cosine similarity, from the FAISS
+    index of one table (or all of them), with each row's pk, text and score.
+    """
+    if semantic is None:
+        raise HTTPException(status_code=503, detail="Semantic search is not available, build the indexes with embeddings_pipeline.py")
+    try:
+        results = await semantic.search(q, table, k)
+        return json_response(orjson.dumps({'query': q, 'results': results}))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No index for table {table}, available: {', '.join(semantic.tables)}")
+    except Exception as e:
+        print(f"Error in semantic search: {e}")
+        raise HTTPException(status_code=500, detail=f"Error in semantic search: {str(e)}")
+
+@app.get("/semantic-search/stats")
+async def get_semantic_search_stats() -> Dict[str, Any]:
+    """Vectors per table and encoder batch counters"""
+    if semantic is None:
+        raise HTTPException(status_code=503, detail="Semantic search is not available")
+    return semantic.stats()
+
+@app.get("/stats/summary")
+async def get_stats_summary(request: Request) -> Response:
+    """
+    Stadium counts by pitch type and country, squad sizes per format and
+    profile counts per game type, read from the materialized summary views
+    that each scraper refreshes when it finishes.
+    """
+    try:
+        key = ('stats-summary',)
+        validators = validators_for(key, list(SUMMARY_VIEWS))
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        async def load_summary():
+            stadiums, squads, profiles = await asyncio.gather(
+                db.fetch_all(STADIUM_SUMMARY_SQL),
+                db.fetch_all(SQUAD_SUMMARY_SQL),
+                db.fetch_all(PROFILE_SUMMARY_SQL),
+            )
+            return {
+                'stadiums': stadium_breakdown(stadiums),
+                'squads': squads,
+                'profiles': profiles,
+            }
+
+        summary = await cached_json(key, list(SUMMARY_VIEWS), load_summary)
+        return json_response(summary, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching summary: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching summary: {str(e)}")
+
+@app.get("/squad")
+async def get_squad(request: Request, team_name: Optional[str] = None) -> Response:
+    """
+    Every format's squad with the joined player profiles, keyed by format.
+
+    The JSON document is assembled by Postgres and passed through as bytes,
+    so the JSONB stats are never decoded and re-encoded in Python.
+    """
+    try:
+        validators = validators_for(('squad', team_name), ['team_squad_players', 'player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+        async def load_squad():
+            squad = await db.fetch_value(SQUAD_SQL, (team_name, team_name))
+            return squad.encode()
+
+        body = await cache.get_or_load(('squad', team_name), ['team_squad_players', 'player_profiles'], load_squad)
+        return json_response(body, validators)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching squad: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching squad: {str(e)}")
+
+class PlayerProfilesRequest(BaseModel):
+    names: Optional[List[str]] = None
+    ids: Optional[List[int]] = None
+
+@app.post("/player-profiles")
+async def get_player_profiles(request: PlayerProfilesRequest) -> Response:
+    """
+    Fetch many player profiles in one query, by name or by id.
+
+    The result lines up with the requested names (or ids): one profile per
+    entry, in the same order, with null where no profile exists.
+    """
+    try:
+        if (request.names is None) == (request.ids is None):
+            raise HTTPException(status_code=400, detail="Pass exactly one of names or ids")
+        keys = request.names if request.names is not None else request.ids
+        if len(keys) > MAX_BATCH_PROFILES:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PROFILES} profiles per request")
+        column = 'player_name' if request.names is not None else 'id'
+
+        async def load_profiles():
+            # Newest profile wins when two profile pages share a player name
+            rows = await db.fetch_all(player_profiles_sql(column), (list(set(keys)),))
+
+            by_key = {row[column]: row for row in rows}
+            return [by_key.get(key) for key in keys]
+
+        profiles = await cached_json(('player-profiles', column, tuple(keys)), ['player_profiles'], load_profiles)
+        return json_response(profiles)
+
+    except (HTTPException, PoolTimeout):
+        raise
+    except Exception as e:
+        print(f"Error fetching player profiles: {e}")
+        raise HTTPException(status_code=500, detail=f"Error fetching player profiles: {str(e)}")
+
 @app.get("/player-profile/{player_name}")
-async def get_player_profile(player_name: str) -> Dict[str, Any]:
+async def get_player_profile(player_name: str, request: Request) -> Response:
     """Fetch complete player profile data"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+        validators = validators_for(('player-profile', player_name), ['player_profiles'])
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
         # Execute query to fetch player profile
-        cursor.execute("""
-            SELECT id, player_name, profile_url, personal_info, batting_stats, bowling_stats, scraped_at
-            FROM player_profiles
-            WHERE player_name = %s
-        """, (player_name,))
-        
-        # Fetch the row
-        row = cursor.fetchone()
+        player_profile = await cached_json(('player-profile', player_name), ['player_profiles'], lambda: db.fetch_one(PLAYER_PROFILE_SQL, (player_name,)))
         
-        # Close connections
-        cursor.close()
-        conn.close()
-        
-        if not row:
+        if not player_profile:
             raise HTTPException(status_code=404, detail="Player profile not found")
         
-        # Get column names
-        columns = [desc[0] for desc in cursor.description]
-        
-        # Convert row to dictionary
-        player_profile = dict(zip(columns, row))
-        
-        return player_profile
+        return json_response(player_profile, validators)
         
-    except HTTPException:
+    except (HTTPException, PoolTimeout):
         raise
     except Exception as e:
         print(f"Error fetching player profile: {e}")
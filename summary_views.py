@@ -0,0 +1,98 @@
+"""
+Materialized summary views behind summary.py, view_data.py and /stats/summary.
+
+The views (created by migration 12) hold the aggregates those reports used to
+recompute with full-table scans: stadium counts per country and pitch type,
+squad sizes per format and profile counts per game type. They have a handful
+of rows each, so reading them costs the same however many rows they summarize.
+
+Each scraper calls refresh_summary_views at the end of its run. The refresh is
+CONCURRENTLY, so readers keep seeing the previous rows until it commits, and
+it bumps the table's data version so the API drops its cached summary.
+
+Usage:
+  python summary_views.py --refresh   refresh every summary view
+"""
+
+import sys
+import logging
+from typing import Dict, Iterable, List
+
+import psycopg2
+
+from data_versions import VERSIONED_TABLES, bump_data_version
+from migrations import DB_CONFIG, apply_migrations
+
+logger = logging.getLogger(__name__)
+
+# Summary views built from each versioned table
+SUMMARY_VIEWS = {
+    'stadiums': ('stadium_summary',),
+    'team_squad_players': ('squad_summary',),
+    'player_profiles': ('profile_summary',),
+}
+
+STADIUM_SUMMARY_SQL = "SELECT country, pitch_type, stadiums FROM stadium_summary"
+SQUAD_SUMMARY_SQL = "SELECT team_name, format, players, last_scraped FROM squad_summary ORDER BY team_name, format"
+PROFILE_SUMMARY_SQL = "SELECT game_type, discipline, players, matches FROM profile_summary ORDER BY game_type, discipline"
+
+
+def refresh_summary_views(conn, tables: Iterable[str] = VERSIONED_TABLES) -> List[str]:
+    """Refresh the summary views built from tables in one transaction; returns the views refreshed"""
+    refreshed = []
+    try:
+        with conn.cursor() as cursor:
+            for table in tables:
+                for view in SUMMARY_VIEWS.get(table, ()):
+                    cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+                    refreshed.append(view)
+                bump_data_version(cursor, table)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    logger.info("Refreshed summary views: %s", ', '.join(refreshed))
+    return refreshed
+
+
+def stadium_breakdown(rows: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Totals, pitch type distribution and per-country counts from the rows of
+    stadium_summary (country, pitch_type, stadiums)
+    """
+    total = sum(row['stadiums'] for row in rows)
+    pitch_types, countries, batting = {}, {}, {}
+    for row in rows:
+        if row['pitch_type'] is not None:
+            pitch_types[row['pitch_type']] = pitch_types.get(row['pitch_type'], 0) + row['stadiums']
+        countries[row['country']] = countries.get(row['country'], 0) + row['stadiums']
+        if row['pitch_type'] == 'Batting':
+            batting[row['country']] = batting.get(row['country'], 0) + row['stadiums']
+
+    def ranked(counts):
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    return {
+        'total': total,
+        'pitch_types': [
+            {'pitch_type': pitch_type, 'count': count, 'percentage': round(count * 100.0 / total, 2)}
+            for pitch_type, count in ranked(pitch_types)
+        ],
+        'countries': [
+            {'country': country, 'count': count, 'batting_count': batting.get(country, 0)}
+            for country, count in ranked(countries)
+        ],
+    }
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if '--refresh' not in sys.argv:
+        print(__doc__)
+        sys.exit(1)
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        apply_migrations(conn)
+        print(f"[OK] Refreshed {len(refresh_summary_views(conn))} summary views")
+    finally:
+        conn.close()
@@ -0,0 +1,26 @@
+from check_query_plans import find_seq_scans
+
+# Plans in the shape EXPLAIN (FORMAT JSON) returns them
+index_plan = {
+    'Node Type': 'Limit',
+    'Plans': [{'Node Type': 'Index Scan', 'Relation Name': 'stadiums', 'Index Name': 'idx_stadiums_ground_name_id'}],
+}
+join_plan = {
+    'Node Type': 'Limit',
+    'Plans': [{
+        'Node Type': 'Hash Right Join',
+        'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'player_profiles'},
+            {'Node Type': 'Hash', 'Plans': [
+                {'Node Type': 'Bitmap Heap Scan', 'Relation Name': 'team_squad_players'},
+            ]},
+        ],
+    }],
+}
+
+if __name__ == "__main__":
+    assert list(find_seq_scans(index_plan)) == []
+    print("[OK] index-only plan has no sequential scans")
+
+    assert list(find_seq_scans(join_plan)) == ['player_profiles']
+    print("[OK] nested sequential scan found in join plan")
@@ -0,0 +1,34 @@
+import requests
+
+# Check ETag / Last-Modified revalidation on the Stadiums API
+BASE_URL = "http://localhost:8001"
+
+def check_endpoint(path):
+    first = requests.get(f"{BASE_URL}{path}", timeout=10)
+    assert first.status_code == 200, first.text
+    etag = first.headers.get('ETag')
+    last_modified = first.headers.get('Last-Modified')
+    if not etag:
+        print(f"[SKIP] {path}: no validators yet (is the change listener connected?)")
+        return
+
+    # Weak: the gzip and identity encodings share the validator
+    assert etag.startswith('W/"'), etag
+    by_etag = requests.get(f"{BASE_URL}{path}", headers={'If-None-Match': etag}, timeout=10)
+    assert by_etag.status_code == 304 and not by_etag.content
+    assert 'Accept-Encoding' in by_etag.headers.get('Vary', '')
+    strong = requests.get(f"{BASE_URL}{path}", headers={'If-None-Match': etag[2:]}, timeout=10)
+    assert strong.status_code == 304
+    by_date = requests.get(f"{BASE_URL}{path}", headers={'If-Modified-Since': last_modified}, timeout=10)
+    assert by_date.status_code == 304
+    stale = requests.get(f"{BASE_URL}{path}", headers={'If-None-Match': '"stale"'}, timeout=10)
+    assert stale.status_code == 200
+    print(f"[OK] {path}: ETag {etag}, Last-Modified {last_modified}")
+
+if __name__ == "__main__":
+    check_endpoint("/stadiums")
+    check_endpoint("/players/test")
+    check_endpoint("/squad")
+    players = requests.get(f"{BASE_URL}/players/test", timeout=10).json()
+    if players:
+        check_endpoint(f"/player-profile/{players[0]['player_name']}")
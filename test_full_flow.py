@@ -37,3 +37,15 @@ if response.status_code == 200:
                 print(f"  Profile Status: {profile_response.status_code}")
 else:
     print(f"Error fetching players: {response.status_code}")
+
+# Fetch every profile on the page in one round trip
+print("\n=== Testing batch profile fetch ===")
+if response.status_code == 200:
+    names = [player.get('player_name') for player in players]
+    batch_response = requests.post('http://localhost:8001/player-profiles', json={'names': names + ['No Such Player']})
+    print(f"Batch Status: {batch_response.status_code}")
+    if batch_response.status_code == 200:
+        profiles = batch_response.json()
+        assert len(profiles) == len(names) + 1 and profiles[-1] is None
+        found = sum(1 for profile in profiles if profile)
+        print(f"Profiles found: {found} of {len(names)}, unknown player returned null")
@@ -0,0 +1,30 @@
+from bs4 import BeautifulSoup
+
+from player_profile_scraper import PlayerProfileScraper
+from player_stats import normalize_game_type, parse_number, stats_rows
+
+# Parse the saved Sportskeeda profile page into typed per-format stats rows
+if __name__ == "__main__":
+    with open('player_profile_sample.html', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    scraper = PlayerProfileScraper(db_config={})
+    profile = {
+        'player_name': 'Sample Player',
+        'profile_url': 'https://www.sportskeeda.com/player/sample',
+        'batting_stats': scraper.parse_stats(soup, 'Batting Stats'),
+        'bowling_stats': scraper.parse_stats(soup, 'Bowling Stats'),
+    }
+
+    assert normalize_game_type('TESTs') == 'TEST' and normalize_game_type('test') == 'TEST'
+    assert normalize_game_type('T20Is') == 'T20I' and normalize_game_type('odi') == 'ODI'
+    assert parse_number('158*') == 158.0 and parse_number('-') is None and parse_number('') is None
+    print("[OK] game types and numbers normalized")
+
+    rows = {(row[2], row[3]): row for row in stats_rows(profile)}
+    print(f"[OK] {len(rows)} stats rows: {sorted(rows)}")
+
+    odi_batting = rows[('ODI', 'batting')]
+    assert odi_batting[4:9] == (134, 131, 6291, 54.23, 87.63)
+    test_bowling = rows[('TEST', 'bowling')]
+    assert test_bowling[4] == 61 and test_bowling[9] == 2 and test_bowling[10] == 2.8
+    print("[OK] ODI batting and TEST bowling columns typed correctly")
@@ -0,0 +1,46 @@
+import numpy as np
+
+from shot_similarity import dtw, shot_similarity, cosine_distance_matrix
+
+
+def test_identical_clips():
+    """Identical clips align on the diagonal with a perfect score"""
+    rng = np.random.default_rng(0)
+    frames = rng.random((30, 1280), dtype=np.float32)
+    score, path = shot_similarity(frames, frames)
+    print(f"Identical clips score: {score:.4f}")
+    assert abs(score - 1.0) < 1e-5
+    assert np.array_equal(path, np.stack([np.arange(30), np.arange(30)], axis=1))
+
+
+def test_same_shot_different_tempo():
+    """A slowed-down copy of a clip still aligns frame for frame"""
+    rng = np.random.default_rng(1)
+    frames = rng.random((20, 64), dtype=np.float32)
+    slow = np.repeat(frames, 2, axis=0)
+    score, path = shot_similarity(frames, slow, band=4)
+    print(f"Different tempo score: {score:.4f}, path length: {len(path)}")
+    assert abs(score - 1.0) < 1e-5
+    assert np.all(path[:, 0] == path[:, 1] // 2)
+
+
+def test_matches_reference_dtw():
+    """The vectorized DTW matches a plain double loop"""
+    rng = np.random.default_rng(2)
+    cost = cosine_distance_matrix(rng.random((12, 8)), rng.random((17, 8)))
+    reference = np.full((13, 18), np.inf)
+    reference[0, 0] = 0.0
+    for i in range(1, 13):
+        for j in range(1, 18):
+            reference[i, j] = cost[i - 1, j - 1] + min(reference[i - 1, j], reference[i, j - 1], reference[i - 1, j - 1])
+    total, path = dtw(cost)
+    print(f"Vectorized DTW: {total:.6f}, reference: {reference[12, 17]:.6f}")
+    assert abs(total - reference[12, 17]) < 1e-9
+    assert abs(cost[path[:, 0], path[:, 1]].astype(np.float64).sum() - total) < 1e-6
+
+
+if __name__ == "__main__":
+    test_identical_clips()
+    test_same_shot_different_tempo()
+    test_matches_reference_dtw()
+    print("All similarity checks passed")
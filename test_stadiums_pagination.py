@@ -0,0 +1,46 @@
+import requests
+
+# Walk /stadiums page by page and check the keyset pagination
+BASE_URL = "http://localhost:8001"
+
+def fetch_all_pages(params):
+    rows, cursor, pages = [], None, 0
+    while True:
+        query = dict(params)
+        if cursor:
+            query['cursor'] = cursor
+        response = requests.get(f"{BASE_URL}/stadiums", params=query, timeout=10)
+        assert response.status_code == 200, response.text
+        rows.extend(response.json())
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return rows, pages
+
+if __name__ == "__main__":
+    rows, pages = fetch_all_pages({'limit': 7, 'fields': 'id,ground_name'})
+    keys = [(row['ground_name'], row['id']) for row in rows]
+    assert keys == sorted(keys), "pages are not in (ground_name, id) order"
+    assert len(set(keys)) == len(keys), "a stadium appeared on two pages"
+    assert all(set(row) == {'id', 'ground_name'} for row in rows)
+    print(f"[OK] {len(rows)} stadiums over {pages} pages, in order, no duplicates")
+
+    # Without limit or cursor the endpoint still returns every stadium in one response
+    response = requests.get(f"{BASE_URL}/stadiums", timeout=10)
+    assert response.status_code == 200 and 'X-Next-Cursor' not in response.headers
+    assert len(response.json()) == len(rows)
+    print(f"[OK] unpaginated request returned all {len(rows)} stadiums")
+
+    batting, _ = fetch_all_pages({'pitch_type': 'Batting', 'fields': 'pitch_type'})
+    assert all(row['pitch_type'] == 'Batting' for row in batting)
+    print(f"[OK] pitch_type filter returned {len(batting)} stadiums")
+
+    if rows:
+        prefix = rows[0]['ground_name'][:3].lower()
+        matches, _ = fetch_all_pages({'name_prefix': prefix, 'fields': 'ground_name'})
+        assert matches and all(row['ground_name'].lower().startswith(prefix) for row in matches)
+        print(f"[OK] name_prefix '{prefix}' returned {len(matches)} stadiums")
+
+    response = requests.get(f"{BASE_URL}/stadiums", params={'fields': 'nope'}, timeout=10)
+    assert response.status_code == 400
+    print("[OK] unknown fields are rejected")
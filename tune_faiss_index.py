@@ -0,0 +1,148 @@
+"""
+Compare FAISS index types and search settings on a table's embeddings.
+
+Reads the vectors of an exact (flat) index built by embeddings_pipeline.py,
+builds IVF-Flat, IVF-PQ and HNSW indexes over them with the same training
+sample selection the pipeline uses, and for each nlist / nprobe / M /
+efSearch setting reports:
+
+  recall@k   overlap of its top k with the exact top k, over --queries
+             vectors drawn from the table
+  p50, p99   single-query search latency
+  memory     serialized index size
+  build      time to train the index and add every vector
+
+It then suggests the fastest setting that reaches --target-recall, as the
+embeddings_pipeline.py flags that build it. The chosen parameters are
+recorded in that table's manifest under "index" when the pipeline runs.
+
+Usage:
+  python tune_faiss_index.py --table stadiums [--out faiss_indexes] [--k 10] [--target-recall 0.95]
+"""
+
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+import faiss
+
+from embeddings_pipeline import auto_nlist, index_config, make_index, apply_search_params, resolve_table_name
+
+NPROBES = (1, 2, 4, 8, 16, 32, 64)
+EF_SEARCHES = (16, 32, 64, 128, 256)
+HNSW_MS = (16, 32)
+
+
+def flat_vectors(index_path: str) -> np.ndarray:
+    """The raw vectors of an IDMap,Flat index"""
+    index = faiss.read_index(index_path)
+    flat = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else faiss.downcast_index(index)
+    if not isinstance(flat, faiss.IndexFlat):
+        raise SystemExit(f"{index_path} is not a flat index, rebuild it with --index-type flat --full first")
+    return faiss.vector_to_array(flat.codes).view(np.float32).reshape(flat.ntotal, flat.d)
+
+
+def build(config, vectors, rng):
+    """Index for config over vectors, trained on a random sample of the configured size"""
+    start = time.perf_counter()
+    index = make_index(config, vectors.shape[1])
+    if not index.is_trained:
+        sample = rng.choice(len(vectors), config["training_rows"], replace=False)
+        index.train(vectors[sample])
+    index.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+    return index, time.perf_counter() - start
+
+
+def measure(index, queries, truth, k):
+    found = np.empty_like(truth)
+    timings = []
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i:i + 1], k)
+        timings.append((time.perf_counter() - start) * 1000)
+        found[i] = ids[0]
+    recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+    p50, p99 = np.percentile(timings, [50, 99])
+    return recall, p50, p99
+
+
+def candidates(n, d, nlists):
+    """(label, config, search params) for every setting to try, grouped by index built"""
+    yield "flat", index_config(n, d), [{}]
+    for index_type in ("ivf-flat", "ivf-pq"):
+        for nlist in nlists:
+            config = index_config(n, d, type=index_type, nlist=nlist)
+            if config["type"] != index_type:
+                continue
+            yield index_type, config, [{"nprobe": p} for p in NPROBES if p <= nlist]
+    for m in HNSW_MS:
+        yield "hnsw", index_config(n, d, type="hnsw", hnsw_m=m), [{"efSearch": ef} for ef in EF_SEARCHES]
+
+
+def pipeline_flags(config, params):
+    flags = [f"--index-type {config['type']}"]
+    for key, flag in (("nlist", "--nlist"), ("pq_m", "--pq-m"), ("pq_bits", "--pq-bits"), ("hnsw_m", "--hnsw-m")):
+        if key in config:
+            flags.append(f"{flag} {config[key]}")
+    if "nprobe" in params:
+        flags.append(f"--nprobe {params['nprobe']}")
+    if "efSearch" in params:
+        flags.append(f"--ef-search {params['efSearch']}")
+    return " ".join(flags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall, latency and memory of FAISS index settings")
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--out", default="faiss_indexes", help="Directory the pipeline wrote the indexes to")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nlist", type=int, nargs="*", help="nlist values to try (default auto / 2, auto, auto * 2)")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    table = resolve_table_name(args.table)
+    with open(os.path.join(args.out, f"{table}_manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    vectors = flat_vectors(os.path.join(args.out, os.path.basename(manifest["index_path"])))
+    n, d = vectors.shape
+    k = min(args.k, n)
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(n, min(args.queries, n), replace=False)]
+
+    exact = faiss.IndexFlatIP(d)
+    exact.add(vectors)
+    _, truth = exact.search(queries, k)
+
+    auto = auto_nlist(n)
+    nlists = args.nlist or sorted({max(2, auto // 2), auto, auto * 2})
+    print(f"{table}: {n} vectors of dimension {d}, {len(queries)} queries, recall@{k}")
+    print(f"{'index':10} | {'factory':>14} | {'search':>12} | {'recall':>6} | {'p50':>8} | {'p99':>8} | {'memory':>9} | {'build':>7}")
+    print("-" * 99)
+
+    results = []
+    for label, config, settings in candidates(n, d, nlists):
+        index, build_seconds = build(config, vectors, rng)
+        memory = len(faiss.serialize_index(index)) / 1e6
+        for params in settings:
+            apply_search_params(index, params)
+            recall, p50, p99 = measure(index, queries, truth, k)
+            setting = ",".join(f"{key}={value}" for key, value in params.items()) or "exact"
+            built = config["factory"].replace("IDMap,", "")
+            print(f"{label:10} | {built:>14} | {setting:>12} | {recall:6.3f} | {p50:5.3f} ms | {p99:5.3f} ms | {memory:6.2f} MB | {build_seconds:6.2f}s")
+            results.append((recall, p50, config, params))
+        print("-" * 99)
+
+    good = [result for result in results if result[0] >= args.target_recall]
+    if not good:
+        print(f"No setting reached recall {args.target_recall}; keep the flat index")
+        return
+    recall, p50, config, params = min(good, key=lambda result: result[1])
+    print(f"Fastest with recall >= {args.target_recall}: recall {recall:.3f}, p50 {p50:.3f} ms")
+    print(f"  python embeddings_pipeline.py --tables {table} {pipeline_flags(config, params)} --full")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Uploads at or below this many bytes are decoded from memory instead of the temp directory
+DEFAULT_MEMORY_THRESHOLD = int(os.environ.get('UPLOAD_MEMORY_THRESHOLD', 64 * 1024 * 1024))
+
+# Storage modes accepted by open_upload_path
+STORAGE_MODES = ('auto', 'memory', 'disk')
+DEFAULT_STORAGE_MODE = os.environ.get('UPLOAD_STORAGE_MODE', 'auto')
+
+
+def memfd_supported():
+    """Return True if anonymous memory files can be handed to OpenCV by path"""
+    return hasattr(os, 'memfd_create') and os.path.isdir('/proc/self/fd')
+
+
+def upload_size(fileobj):
+    """
+    Return the number of bytes left to read in an upload, or None if unknown.
+
+    Works for Starlette's SpooledTemporaryFile, Streamlit's UploadedFile and plain file objects.
+    """
+    size = getattr(fileobj, 'size', None)
+    if isinstance(size, int):
+        return size
+    try:
+        position = fileobj.tell()
+        end = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def upload_digest(fileobj):
+    """Return the sha256 hex digest of an upload, leaving its read position unchanged"""
+    getvalue = getattr(fileobj, 'getvalue', None)
+    if getvalue is not None:
+        return hashlib.sha256(getvalue()).hexdigest()
+    position = fileobj.tell()
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b''):
+        digest.update(chunk)
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _memory_path(fileobj, name):
+    fd = os.memfd_create(name, os.MFD_CLOEXEC)
+    try:
+        with os.fdopen(fd, 'wb', closefd=False) as dst:
+            shutil.copyfileobj(fileobj, dst)
+        yield f'/proc/self/fd/{fd}'
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def _disk_path(fileobj, suffix, temp_dir):
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=temp_dir) as tmpfile:
+        shutil.copyfileobj(fileobj, tmpfile)
+        tmp_path = tmpfile.name
+    try:
+        yield tmp_path
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError as e:
+            logger.warning(f"Failed to delete temporary file {tmp_path}: {e}")
+
+
+def resolve_storage_mode(size, mode=DEFAULT_STORAGE_MODE, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """
+    Decide where an upload of the given size should live while it is decoded.
+
+    Args:
+      size: Upload size in bytes, or None if unknown.
+      mode: 'auto', 'memory' or 'disk'.
+      memory_threshold: Largest upload (in bytes) that 'auto' keeps in memory.
+
+    Returns:
+      'memory' or 'disk'.
+    """
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {mode}")
+    if mode == 'disk' or not memfd_supported():
+        return 'disk'
+    if mode == 'memory':
+        return 'memory'
+    if size is not None and size <= memory_threshold:
+        return 'memory'
+    return 'disk'
+
+
+@contextmanager
+def open_upload_path(fileobj, suffix='.mp4', mode=DEFAULT_STORAGE_MODE, memory_threshold=DEFAULT_MEMORY_THRESHOLD, temp_dir=None):
+    """
+    Expose an uploaded file to OpenCV as a path for the duration of the block.
+
+    Small uploads are copied into an anonymous memfd and exposed as /proc/self/fd/<n>,
+    so nothing touches the temp directory. Larger uploads (or platforms without memfd)
+    fall back to a NamedTemporaryFile that is removed when the block exits.
+
+    Args:
+      fileobj: Readable binary file object positioned at the start of the upload.
+      suffix: File extension used for the on-disk fallback.
+      mode: 'auto', 'memory' or 'disk'.
+      memory_threshold: Largest upload (in bytes) that 'auto' keeps in memory.
+      temp_dir: Directory for the on-disk fallback (defaults to the system temp directory).
+
+    Yields:
+      A filesystem path readable by cv2.VideoCapture.
+    """
+    storage = resolve_storage_mode(upload_size(fileobj), mode, memory_threshold)
+    if storage == 'memory':
+        with _memory_path(fileobj, 'upload' + suffix) as path:
+            yield path
+    else:
+        with _disk_path(fileobj, suffix, temp_dir) as path:
+            yield path
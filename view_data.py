@@ -1,6 +1,8 @@
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from summary_views import STADIUM_SUMMARY_SQL, stadium_breakdown
+
 def view_scraped_data():
     """View the scraped stadium data"""
     try:
@@ -13,22 +15,14 @@ def view_scraped_data():
         )
         
         with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            # Get total count
-            cursor.execute("SELECT COUNT(*) as total FROM stadiums")
-            total = cursor.fetchone()['total']
-            print(f"Total stadiums scraped: {total}")
+            # Counts come from the stadium_summary view, refreshed after each scrape
+            cursor.execute(STADIUM_SUMMARY_SQL)
+            summary = stadium_breakdown(cursor.fetchall())
+            print(f"Total stadiums scraped: {summary['total']}")
             print("=" * 80)
             
-            # Get pitch type distribution
-            cursor.execute("""
-                SELECT pitch_type, COUNT(*) as count 
-                FROM stadiums 
-                WHERE pitch_type IS NOT NULL 
-                GROUP BY pitch_type 
-                ORDER BY count DESC
-            """)
             print("Pitch Type Distribution:")
-            for row in cursor.fetchall():
+            for row in summary['pitch_types']:
                 print(f"  {row['pitch_type']}: {row['count']} stadiums")
             print()
             